@@ -15,7 +15,7 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 from app.core.database import Base
-from app.models import user, resume, chat, analysis
+from app.models import user, resume, chat, analysis, document_cache
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -0,0 +1,35 @@
+"""document cache
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_cache",
+        sa.Column("content_hash", sa.String(64), primary_key=True),
+        sa.Column("resume_text", sa.Text(), nullable=False),
+        sa.Column("parsed_data", sa.Text(), nullable=False),
+        sa.Column("analysis_data", sa.Text(), nullable=True),
+        sa.Column("scorer_version", sa.String(), nullable=True),
+        sa.Column("hit_count", sa.Integer(), default=0),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("document_cache")
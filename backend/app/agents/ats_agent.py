@@ -1,10 +1,16 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
+import threading
+from collections import OrderedDict
 from pydantic import BaseModel, Field
 from typing import List
-from app.core.config import settings
 from app.agents.types import AgentState
 from app.schemas.ats import ATSOutput, ATSFix
-from app.services.ats_scorer import compute_ats_scores
+from app.services.llm_cache import CachedModel
+from app.services.llm_registry import get_llm
+from app.services.resume_context import resume_context
+from app.services.ats_scorer import ATSScoreHandle, rescore
+from app.services.score_cache import cached_ats_scores
+from app.services.sections import section_index_from_data, section_outline
 
 
 class QualitativeAnalysis(BaseModel):
@@ -16,14 +22,31 @@ class QualitativeAnalysis(BaseModel):
     keyword_suggestions: List[str] = Field(description="Specific keywords to add for better ATS matching")
 
 
-_llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0,
-    google_api_key=settings.google_api_key,
-    model_kwargs={"generation_config": {"seed": 42}},
-)
+_structured_llm = CachedModel(get_llm(temperature=0, seed=42), "ats", QualitativeAnalysis)
+
+# Last score handle per session, so re-scoring an edited resume (e.g. after the
+# enhance intent) only extracts features for the lines that changed.
+_MAX_SCORE_HANDLES = 1000
+_score_handles: "OrderedDict[str, ATSScoreHandle]" = OrderedDict()
+_score_handles_lock = threading.Lock()
+
+
+def _score_for_session(session_id: str, resume_text: str) -> dict:
+    with _score_handles_lock:
+        previous = _score_handles.get(session_id)
+    handle = rescore(previous, resume_text)
+    if session_id:
+        with _score_handles_lock:
+            _score_handles[session_id] = handle
+            _score_handles.move_to_end(session_id)
+            while len(_score_handles) > _MAX_SCORE_HANDLES:
+                _score_handles.popitem(last=False)
+    return handle.scores
+
+
+def session_ats_scores(session_id: str, resume_text: str) -> dict:
+    return cached_ats_scores(resume_text, lambda text: _score_for_session(session_id, text))
 
-_structured_llm = _llm.with_structured_output(QualitativeAnalysis)
 
 _QUALITATIVE_PROMPT = """You are an expert ATS (Applicant Tracking System) consultant. Review the resume below and provide qualitative analysis.
 
@@ -37,24 +60,30 @@ Focus ONLY on:
 
 Do NOT assign any numeric scores. Do NOT calculate any ratings. Only provide qualitative analysis.
 
+Section headings detected by the ATS parser: {sections}
+
 Resume:
 {resume_text}
 """
 
 
-def ats_optimization_node(state: AgentState) -> AgentState:
+async def ats_optimization_node(state: AgentState) -> AgentState:
     resume_text = state.get("resume_text", "")
 
     if not resume_text.strip():
         return {**state, "error": "No resume found. Upload a resume first."}
 
     # ── Step 1: Python computes deterministic scores ──
-    scores = compute_ats_scores(resume_text)
+    session_id = state.get("session_id", "")
+    scores = await asyncio.to_thread(session_ats_scores, session_id, resume_text)
 
     # ── Step 2: Gemini provides qualitative analysis only ──
     try:
-        qualitative = _structured_llm.invoke(
-            _QUALITATIVE_PROMPT.format(resume_text=resume_text)
+        qualitative = await _structured_llm.ainvoke(
+            _QUALITATIVE_PROMPT.format(
+                resume_text=resume_context(resume_text, "ats").text,
+                sections=section_outline(section_index_from_data(state.get("resume_data"), resume_text)),
+            )
         )
     except Exception as e:
         return {**state, "error": f"ATS qualitative analysis failed: {str(e)}"}
@@ -1,28 +1,25 @@
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.core.config import settings
 from app.agents.types import AgentState
+from app.services.structured_output import StructuredModel
+from app.services.llm_registry import get_llm
+from app.services.resume_context import resume_context
 from app.schemas.career_path import CareerPathOutput, SkillGap, Certification, LearningMilestone
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.3,
-    google_api_key=settings.google_api_key,
-)
+llm = StructuredModel(get_llm(temperature=0.3), "career_path", CareerPathOutput)
 
 
-def career_path_node(state: AgentState) -> AgentState:
+async def career_path_node(state: AgentState) -> AgentState:
     resume_text = state.get("resume_text", "")
     job_description = state.get("job_description", "")
     target_role = job_description if job_description else "senior role in your field"
 
     if not resume_text.strip():
         return {**state, "error": "No resume found. Upload a resume first."}
+    resume_block = resume_context(resume_text, "career_path").text
 
     prompt = f"""You are a career development expert. Analyze the resume and create a career advancement roadmap.
 
 Resume:
-{resume_text}
+{resume_block}
 
 Target Role: {target_role}
 
@@ -42,11 +39,7 @@ Return ONLY valid JSON in this exact format:
 }}"""
 
     try:
-        response = llm.invoke(prompt).content.strip()
-        if response.startswith("```"):
-            response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(response)
-        output = CareerPathOutput(**data)
+        output, data = await llm.ainvoke(prompt)
     except Exception as e:
         return {**state, "error": f"Career path analysis failed: {str(e)}"}
 
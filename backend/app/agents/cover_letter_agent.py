@@ -1,30 +1,24 @@
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.core.config import settings
+from typing import AsyncIterator
 from app.agents.types import AgentState
+from app.services.structured_output import StructuredModel
+from app.services.llm_registry import get_llm
+from app.services.resume_context import resume_context
+from app.services.streaming import StructuredEvent, stream_structured
 from app.schemas.cover_letter import CoverLetterOutput, ToneVariant
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.4,
-    google_api_key=settings.google_api_key,
-)
+llm = StructuredModel(get_llm(temperature=0.4), "cover_letter", CoverLetterOutput)
 
 
-def cover_letter_node(state: AgentState) -> AgentState:
-    resume_text = state.get("resume_text", "")
-    job_description = state.get("job_description", "")
-
-    if not resume_text:
-        return {**state, "error": "No resume found. Upload a resume first."}
+def _cover_letter_prompt(resume_text: str, job_description: str) -> str:
+    resume_block = resume_context(resume_text, "cover_letter").text
 
     if not job_description:
-        prompt = f"""You are a professional cover letter writer. Write a compelling general cover letter for the candidate based on their resume.
+        return f"""You are a professional cover letter writer. Write a compelling general cover letter for the candidate based on their resume.
 
 The cover letter should highlight the candidate's strengths, experience, and skills. Make it adaptable so they can customize it for any job application.
 
 Resume:
-{resume_text}
+{resume_block}
 
 Return ONLY valid JSON in this exact format:
 {{
@@ -35,11 +29,10 @@ Return ONLY valid JSON in this exact format:
     {{"tone": "concise", "content": "Brief, punchy version..."}}
   ]
 }}"""
-    else:
-        prompt = f"""You are a professional cover letter writer. Write a tailored cover letter based on the resume and job description.
+    return f"""You are a professional cover letter writer. Write a tailored cover letter based on the resume and job description.
 
 Resume:
-{resume_text}
+{resume_block}
 
 Job Description:
 {job_description}
@@ -54,12 +47,19 @@ Return ONLY valid JSON in this exact format:
   ]
 }}"""
 
+
+# Sent as each one is complete: the main letter first, then every variant.
+COVER_LETTER_STREAM_FIELDS = [("primary_letter",), ("tone_variants", "*")]
+
+
+async def cover_letter_node(state: AgentState) -> AgentState:
+    resume_text = state.get("resume_text", "")
+    if not resume_text:
+        return {**state, "error": "No resume found. Upload a resume first."}
+    prompt = _cover_letter_prompt(resume_text, state.get("job_description", ""))
+
     try:
-        response = llm.invoke(prompt).content.strip()
-        if response.startswith("```"):
-            response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(response)
-        output = CoverLetterOutput(**data)
+        output, data = await llm.ainvoke(prompt)
     except Exception as e:
         return {**state, "error": f"Cover letter generation failed: {str(e)}"}
 
@@ -68,3 +68,15 @@ Return ONLY valid JSON in this exact format:
         "analysis_results": {**state.get("analysis_results", {}), "cover_letter": data},
         "output": output,
     }
+
+
+async def stream_cover_letter(state: AgentState) -> AsyncIterator[StructuredEvent]:
+    resume_text = state.get("resume_text", "")
+    if not resume_text:
+        yield StructuredEvent("error", value="No resume found. Upload a resume first.")
+        return
+    prompt = _cover_letter_prompt(resume_text, state.get("job_description", ""))
+    async for event in stream_structured(
+        llm, prompt, COVER_LETTER_STREAM_FIELDS, "Cover letter generation failed"
+    ):
+        yield event
@@ -0,0 +1,109 @@
+import asyncio
+from typing import Callable, Dict, List
+
+from app.agents.types import AgentState
+from app.agents.resume_agent import analyze_resume_node
+from app.agents.ats_agent import ats_optimization_node, session_ats_scores
+from app.agents.job_matching_agent import job_matching_node
+from app.agents.career_path_agent import career_path_node
+from app.agents.interview_agent import interview_prep_node
+from app.core.config import settings
+from app.services.sections import section_index_from_data
+
+# The full_report intent runs these nodes as parallel branches of one graph
+# run, so the report takes about as long as its slowest branch.
+REPORT_BRANCHES: Dict[str, Callable] = {
+    "analyze": analyze_resume_node,
+    "ats": ats_optimization_node,
+    "job_match": job_matching_node,
+    "career_path": career_path_node,
+    "interview_prep": interview_prep_node,
+}
+# Branches that only make sense with a given state field; without it they
+# are reported as skipped.
+REPORT_REQUIRES: Dict[str, str] = {"job_match": "job_description"}
+
+
+def report_node_name(branch: str) -> str:
+    return f"report_{branch}"
+
+
+async def report_prep_node(state: AgentState) -> AgentState:
+    # Shared preprocessing: score and index the resume once, so the analyze
+    # and ats branches both start from the warm score cache and the stored
+    # section index.
+    resume_text = state.get("resume_text", "")
+    if not resume_text.strip():
+        return {"error": "No resume found. Upload a resume first."}
+    await asyncio.to_thread(session_ats_scores, state.get("session_id", ""), resume_text)
+    resume_data = dict(state.get("resume_data") or {})
+    resume_data["section_index"] = [
+        span._asdict() for span in section_index_from_data(resume_data, resume_text)
+    ]
+    return {"resume_data": resume_data}
+
+
+def report_fan_out(state: AgentState) -> List[str]:
+    # Every branch always runs (skipped ones return at once): the merge
+    # waits on all of them.
+    if state.get("error"):
+        return ["report_merge"]
+    return [report_node_name(branch) for branch in REPORT_BRANCHES]
+
+
+def make_report_branch(branch: str, node: Callable) -> Callable:
+    # Runs one agent node on its own copy of the state. Branches only write
+    # their own entry of report_branches, so they never conflict; a failure
+    # or timeout is recorded there instead of failing the whole report.
+    async def run_branch(state: AgentState) -> AgentState:
+        required = REPORT_REQUIRES.get(branch)
+        if required and not str(state.get(required) or "").strip():
+            return {"report_branches": {branch: {"status": "skipped"}}}
+        timeout = settings.full_report_branch_timeout_seconds
+        before = state.get("analysis_results") or {}
+        try:
+            result = await asyncio.wait_for(node(dict(state)), timeout)
+        except asyncio.TimeoutError:
+            outcome = {"status": "timeout", "error": f"Timed out after {timeout:g}s"}
+        except Exception as e:
+            outcome = {"status": "error", "error": str(e)}
+        else:
+            if result.get("error"):
+                outcome = {"status": "error", "error": result["error"]}
+            else:
+                # Nodes return the session's whole analysis_results; keep
+                # only what this branch added or changed, or its copies of
+                # older entries would overwrite the other branches' fresh ones.
+                changed = {
+                    key: value
+                    for key, value in (result.get("analysis_results") or {}).items()
+                    if key not in before or before[key] != value
+                }
+                outcome = {"status": "ok", "output": result.get("output"), "analysis_results": changed}
+        return {"report_branches": {branch: outcome}}
+
+    return run_branch
+
+
+async def report_merge_node(state: AgentState) -> AgentState:
+    if state.get("error"):
+        return {}
+    outcomes = state.get("report_branches") or {}
+    analysis_results = dict(state.get("analysis_results") or {})
+    results, errors, skipped = {}, {}, []
+    # Fixed branch order, so the merge does not depend on which branch
+    # finished first.
+    for branch in REPORT_BRANCHES:
+        outcome = outcomes.get(branch, {"status": "skipped"})
+        if outcome["status"] == "skipped":
+            skipped.append(branch)
+        elif outcome["status"] == "ok":
+            analysis_results.update(outcome["analysis_results"])
+            results[branch] = outcome["output"]
+        else:
+            errors[branch] = outcome["error"]
+    return {
+        "analysis_results": analysis_results,
+        "output": {"results": results, "errors": errors, "skipped": skipped},
+        "error": "" if results else "Full report failed: every branch errored",
+    }
@@ -1,28 +1,24 @@
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.core.config import settings
+from typing import AsyncIterator
 from app.agents.types import AgentState
+from app.services.structured_output import StructuredModel
+from app.services.llm_registry import get_llm
+from app.services.resume_context import resume_context
+from app.services.streaming import StructuredEvent, stream_structured
 from app.schemas.interview import InterviewPrepOutput, InterviewQuestion, MockInterviewFeedback
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.4,
-    google_api_key=settings.google_api_key,
-)
+llm = get_llm(temperature=0.4)
+_prep_llm = StructuredModel(llm, "interview_prep", InterviewPrepOutput)
+_mock_llm = StructuredModel(llm, "mock_interview", MockInterviewFeedback)
 
 
-def interview_prep_node(state: AgentState) -> AgentState:
-    resume_text = state.get("resume_text", "")
-    job_description = state.get("job_description", "")
+def _prep_prompt(resume_text: str, job_description: str) -> str:
     target_role = job_description.split("\n")[0] if job_description else "the target role"
+    resume_block = resume_context(resume_text, "interview_prep").text
 
-    if not resume_text.strip():
-        return {**state, "error": "No resume found. Upload a resume first."}
-
-    prompt = f"""You are an interview preparation expert. Generate likely interview questions based on the resume and target role.
+    return f"""You are an interview preparation expert. Generate likely interview questions based on the resume and target role.
 
 Resume:
-{resume_text}
+{resume_block}
 
 Target Role: {target_role}
 {chr(10) + 'Job Description:' + chr(10) + job_description if job_description else ''}
@@ -38,12 +34,19 @@ Return ONLY valid JSON in this exact format:
   "preparation_tips": "2-3 sentence preparation advice"
 }}"""
 
+
+# Sent as each one is complete: the role, every question, then the tips.
+PREP_STREAM_FIELDS = [("target_role",), ("questions", "*"), ("preparation_tips",)]
+
+
+async def interview_prep_node(state: AgentState) -> AgentState:
+    resume_text = state.get("resume_text", "")
+    if not resume_text.strip():
+        return {**state, "error": "No resume found. Upload a resume first."}
+    prompt = _prep_prompt(resume_text, state.get("job_description", ""))
+
     try:
-        response = llm.invoke(prompt).content.strip()
-        if response.startswith("```"):
-            response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(response)
-        output = InterviewPrepOutput(**data)
+        output, data = await _prep_llm.ainvoke(prompt)
     except Exception as e:
         return {**state, "error": f"Interview prep failed: {str(e)}"}
 
@@ -54,7 +57,17 @@ Return ONLY valid JSON in this exact format:
     }
 
 
-def mock_interview_node(state: AgentState) -> AgentState:
+async def stream_interview_prep(state: AgentState) -> AsyncIterator[StructuredEvent]:
+    resume_text = state.get("resume_text", "")
+    if not resume_text.strip():
+        yield StructuredEvent("error", value="No resume found. Upload a resume first.")
+        return
+    prompt = _prep_prompt(resume_text, state.get("job_description", ""))
+    async for event in stream_structured(_prep_llm, prompt, PREP_STREAM_FIELDS, "Interview prep failed"):
+        yield event
+
+
+async def mock_interview_node(state: AgentState) -> AgentState:
     user_message = state.get("user_message", "")
     context = state.get("analysis_results", {}).get("interview_prep", {})
 
@@ -79,11 +92,7 @@ Return ONLY valid JSON in this exact format:
 }}"""
 
     try:
-        response = llm.invoke(prompt).content.strip()
-        if response.startswith("```"):
-            response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(response)
-        output = MockInterviewFeedback(**data)
+        output, _ = await _mock_llm.ainvoke(prompt)
     except Exception as e:
         return {**state, "error": f"Mock interview feedback failed: {str(e)}"}
 
@@ -1,29 +1,26 @@
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.core.config import settings
 from app.agents.types import AgentState
+from app.services.structured_output import StructuredModel
+from app.services.llm_registry import get_llm
+from app.services.resume_context import resume_context
 from app.schemas.job_matching import JobMatchingOutput, SkillGap
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.2,
-    google_api_key=settings.google_api_key,
-)
+llm = StructuredModel(get_llm(temperature=0.2), "job_match", JobMatchingOutput)
 
 
-def job_matching_node(state: AgentState) -> AgentState:
+async def job_matching_node(state: AgentState) -> AgentState:
     resume_text = state.get("resume_text", "")
     job_description = state.get("job_description", "")
 
     if not resume_text.strip():
         return {**state, "error": "No resume found. Upload a resume first."}
+    resume_block = resume_context(resume_text, "job_match").text
     if not job_description.strip():
         return {**state, "error": "A job description is required for job matching."}
 
     prompt = f"""You are a job matching expert. Analyze how well the resume matches the job description.
 
 Resume:
-{resume_text}
+{resume_block}
 
 Job Description:
 {job_description}
@@ -40,11 +37,7 @@ Return ONLY valid JSON in this exact format:
 }}"""
 
     try:
-        response = llm.invoke(prompt).content.strip()
-        if response.startswith("```"):
-            response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(response)
-        output = JobMatchingOutput(**data)
+        output, data = await llm.ainvoke(prompt)
     except Exception as e:
         return {**state, "error": f"Job matching failed: {str(e)}"}
 
@@ -1,15 +1,11 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.core.config import settings
 from app.agents.types import AgentState
+from app.services.llm_cache import CachedModel
+from app.services.llm_registry import get_llm
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.4,
-    google_api_key=settings.google_api_key,
-)
+llm = CachedModel(get_llm(temperature=0.4), "chat")
 
 
-def chat_with_resume_agent(
+async def chat_with_resume_agent(
     analysis: dict,
     chat_history: list,
     user_message: str
@@ -34,18 +30,18 @@ Rules:
     messages.extend(chat_history)
     messages.append({"role": "user", "content": user_message})
 
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
     return response.content.strip()
 
 
-def chat_node(state: AgentState) -> AgentState:
+async def chat_node(state: AgentState) -> AgentState:
     if not state.get("resume_text", "").strip():
         return {**state, "error": "No resume found. Upload a resume first."}
     analysis = state.get("analysis_results", {})
     chat_history = state.get("chat_history", [])
     user_message = state.get("user_message", "")
 
-    reply = chat_with_resume_agent(analysis, chat_history, user_message)
+    reply = await chat_with_resume_agent(analysis, chat_history, user_message)
 
     updated_history = list(chat_history)
     updated_history.append({"role": "user", "content": user_message})
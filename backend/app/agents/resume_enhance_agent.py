@@ -1,13 +1,12 @@
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.core.config import settings
+from typing import AsyncIterator
 from app.agents.types import AgentState
+from app.services.structured_output import StructuredModel
+from app.services.llm_registry import get_llm
+from app.schemas.enhance import EnhanceOutput
+from app.services.resume_context import resume_context
+from app.services.streaming import StructuredEvent, stream_structured
 
-_llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.3,
-    google_api_key=settings.google_api_key,
-)
+_llm = StructuredModel(get_llm(temperature=0.3), "enhance", EnhanceOutput)
 
 ENHANCE_PROMPT = """You are a professional resume writer and ATS optimization expert. Rewrite the resume below to make it significantly stronger.
 
@@ -31,19 +30,24 @@ Original Resume:
 {resume_text}
 """
 
+# The rewritten resume first, then what changed.
+ENHANCE_STREAM_FIELDS = [("enhanced_text",), ("changes_summary",), ("keywords_added",)]
 
-def enhance_resume_node(state: AgentState) -> AgentState:
+
+def _enhance_prompt(resume_text: str) -> str:
+    # The model rewrites the complete resume: never trim lines out of it.
+    return ENHANCE_PROMPT.format(resume_text=resume_context(resume_text, "enhance", trim=False).text)
+
+
+async def enhance_resume_node(state: AgentState) -> AgentState:
     resume_text = state.get("resume_text", "")
     if not resume_text.strip():
         return {**state, "error": "No resume found. Upload a resume first."}
 
-    prompt = ENHANCE_PROMPT.format(resume_text=resume_text)
+    prompt = _enhance_prompt(resume_text)
 
     try:
-        response = _llm.invoke(prompt).content.strip()
-        if response.startswith("```"):
-            response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(response)
+        _, data = await _llm.ainvoke(prompt)
     except Exception as e:
         return {**state, "error": f"Resume enhancement failed: {str(e)}"}
 
@@ -51,3 +55,13 @@ def enhance_resume_node(state: AgentState) -> AgentState:
         **state,
         "output": data,
     }
+
+
+async def stream_enhance_resume(state: AgentState) -> AsyncIterator[StructuredEvent]:
+    resume_text = state.get("resume_text", "")
+    if not resume_text.strip():
+        yield StructuredEvent("error", value="No resume found. Upload a resume first.")
+        return
+    prompt = _enhance_prompt(resume_text)
+    async for event in stream_structured(_llm, prompt, ENHANCE_STREAM_FIELDS, "Resume enhancement failed"):
+        yield event
@@ -1,3 +1,5 @@
+import asyncio
+from functools import lru_cache
 from typing import Literal
 from langgraph.graph import StateGraph, END
 from app.agents.types import AgentState
@@ -9,6 +11,10 @@ from app.agents.cover_letter_agent import cover_letter_node
 from app.agents.interview_agent import interview_prep_node, mock_interview_node
 from app.agents.career_path_agent import career_path_node
 from app.agents.resume_enhance_agent import enhance_resume_node
+from app.agents.full_report_agent import (
+    REPORT_BRANCHES, make_report_branch, report_fan_out, report_merge_node,
+    report_node_name, report_prep_node,
+)
 
 
 def router_node(state: AgentState) -> AgentState:
@@ -18,12 +24,12 @@ def router_node(state: AgentState) -> AgentState:
 
 def should_continue(state: AgentState) -> Literal[
     "analyze", "chat", "job_match", "ats", "cover_letter",
-    "interview_prep", "mock_interview", "career_path", "enhance", "__end__"
+    "interview_prep", "mock_interview", "career_path", "enhance", "full_report", "__end__"
 ]:
     agent = state.get("active_agent", "analyze")
     valid_agents = [
         "analyze", "chat", "job_match", "ats", "cover_letter",
-        "interview_prep", "mock_interview", "career_path", "enhance"
+        "interview_prep", "mock_interview", "career_path", "enhance", "full_report"
     ]
     return agent if agent in valid_agents else "__end__"
 
@@ -42,6 +48,13 @@ def build_supervisor():
     graph.add_node("career_path", career_path_node)
     graph.add_node("enhance", enhance_resume_node)
 
+    # full_report: shared prep, the agents as parallel branches, one merge.
+    branch_nodes = [report_node_name(branch) for branch in REPORT_BRANCHES]
+    graph.add_node("report_prep", report_prep_node)
+    for branch, node in REPORT_BRANCHES.items():
+        graph.add_node(report_node_name(branch), make_report_branch(branch, node))
+    graph.add_node("report_merge", report_merge_node)
+
     graph.set_entry_point("router")
     graph.add_conditional_edges(
         "router",
@@ -56,9 +69,14 @@ def build_supervisor():
             "mock_interview": "mock_interview",
             "career_path": "career_path",
             "enhance": "enhance",
+            "full_report": "report_prep",
             "__end__": END,
         },
     )
+    graph.add_conditional_edges("report_prep", report_fan_out, branch_nodes + ["report_merge"])
+    # Waits for every branch that was started in this run.
+    graph.add_edge(branch_nodes, "report_merge")
+    graph.add_edge("report_merge", END)
 
     for agent in ["analyze", "chat", "job_match", "ats", "cover_letter", "interview_prep", "mock_interview", "career_path", "enhance"]:
         graph.add_edge(agent, END)
@@ -66,4 +84,13 @@ def build_supervisor():
     return graph.compile()
 
 
-supervisor_agent = build_supervisor()
+@lru_cache(maxsize=1)
+def get_supervisor_agent():
+    # Compiled on first use and reused, so importing the app stays cheap.
+    return build_supervisor()
+
+
+def invoke_supervisor(state: AgentState) -> AgentState:
+    # Sync shim for tests and scripts. The nodes are async, so the compiled
+    # graph only runs under ainvoke; routes await get_supervisor_agent().ainvoke.
+    return asyncio.run(get_supervisor_agent().ainvoke(state))
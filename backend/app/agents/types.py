@@ -1,4 +1,9 @@
-from typing import TypedDict, List, Any
+from typing import Annotated, TypedDict, List, Any
+
+
+def merge_dicts(left: dict, right: dict) -> dict:
+    # Reducer for keys that parallel branches write in the same step.
+    return {**(left or {}), **(right or {})}
 
 
 class AgentState(TypedDict):
@@ -13,3 +18,5 @@ class AgentState(TypedDict):
     output: Any
     user_message: str
     error: str
+    # full_report: one entry per branch, see full_report_agent.
+    report_branches: Annotated[dict, merge_dicts]
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional, Any, Literal
-from app.agents.supervisor import supervisor_agent
 from app.agents.types import AgentState
 from app.state.session_store import SESSION_STORE
 
@@ -9,7 +8,7 @@ router = APIRouter(prefix="/agent", tags=["Agent"])
 
 AgentIntent = Literal[
     "analyze", "chat", "job_match", "ats", "cover_letter",
-    "interview_prep", "mock_interview", "career_path", "enhance"
+    "interview_prep", "mock_interview", "career_path", "enhance", "full_report"
 ]
 
 
@@ -32,7 +31,7 @@ class AgentInvokeResponse(BaseModel):
 
 
 @router.post("/invoke", response_model=AgentInvokeResponse)
-def invoke_agent(request: AgentInvokeRequest):
+async def invoke_agent(request: AgentInvokeRequest):
     session = SESSION_STORE.get(request.session_id, {})
 
     initial_state: AgentState = {
@@ -49,8 +48,11 @@ def invoke_agent(request: AgentInvokeRequest):
         "error": "",
     }
 
+    # The agents (langgraph, LangChain) load on the first invocation.
+    from app.agents.supervisor import get_supervisor_agent
+
     try:
-        result = supervisor_agent.invoke(initial_state)
+        result = await get_supervisor_agent().ainvoke(initial_state)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Agent invocation failed: {str(e)}")
 
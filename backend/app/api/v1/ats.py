@@ -0,0 +1,89 @@
+import json
+import uuid
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import get_current_user
+from app.models.user import User
+from app.models.resume import Resume
+from app.services.ats_scorer import compute_ats_scores_batch
+
+router = APIRouter(prefix="/ats", tags=["ATS"])
+
+
+class ScoreBatchRequest(BaseModel):
+    texts: List[str] = []
+    resume_ids: List[str] = []
+
+
+def _parse_resume_ids(resume_ids: List[str]) -> List[uuid.UUID]:
+    parsed = []
+    for rid in resume_ids:
+        try:
+            parsed.append(uuid.UUID(rid))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid resume id: {rid}")
+    return parsed
+
+
+def _stream_text_scores(texts: List[str]):
+    for result in compute_ats_scores_batch(texts):
+        yield json.dumps(result) + "\n"
+
+
+def _stream_resume_scores(user_id, resume_ids: List[uuid.UUID]):
+    # Own session: the stream outlives the request-scoped dependency.
+    db = SessionLocal()
+    try:
+        found = {
+            rid for (rid,) in db.query(Resume.id)
+            .filter(Resume.user_id == user_id, Resume.id.in_(resume_ids))
+        }
+        for rid in resume_ids:
+            if rid not in found:
+                yield json.dumps({"resume_id": str(rid), "error": "Resume not found"}) + "\n"
+
+        rows = (
+            db.query(Resume.id, Resume.resume_text)
+            .filter(Resume.user_id == user_id, Resume.id.in_(found))
+            .yield_per(settings.ats_batch_chunk_size)
+        )
+        order: List[str] = []
+
+        def texts():
+            for rid, text in rows:
+                order.append(str(rid))
+                yield text or ""
+
+        for result in compute_ats_scores_batch(texts()):
+            result["resume_id"] = order[result["index"]]
+            yield json.dumps(result) + "\n"
+    finally:
+        db.close()
+
+
+@router.post("/score-batch")
+def score_batch(
+    request: ScoreBatchRequest,
+    current_user: User = Depends(get_current_user),
+):
+    total = len(request.texts) + len(request.resume_ids)
+    if total == 0:
+        raise HTTPException(status_code=400, detail="Provide texts or resume_ids")
+    if total > settings.ats_batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {total} items (max {settings.ats_batch_max_items})",
+        )
+    if request.texts and request.resume_ids:
+        raise HTTPException(status_code=400, detail="Provide either texts or resume_ids, not both")
+
+    if request.texts:
+        body = _stream_text_scores(request.texts)
+    else:
+        body = _stream_resume_scores(current_user.id, _parse_resume_ids(request.resume_ids))
+
+    return StreamingResponse(body, media_type="application/x-ndjson")
@@ -2,13 +2,15 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Optional
+import json
+from typing import Dict, List, Optional
 from datetime import datetime
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
 from app.models.resume import Resume
 from app.models.analysis import AnalysisResult
+from app.services.score_percentiles import percentile_store
 
 router = APIRouter(tags=["Dashboard"])
 
@@ -24,6 +26,7 @@ class DashboardResponse(BaseModel):
     total_analyses: int = 0
     total_resumes: int = 0
     recent_analyses: List[RecentAnalysis] = []
+    latest_percentiles: Optional[Dict[str, Optional[float]]] = None
 
 
 class HistoryItem(BaseModel):
@@ -82,11 +85,24 @@ def get_dashboard(
         for r, filename in recent
     ]
 
+    latest_percentiles = None
+    if recent:
+        latest, _ = recent[0]
+        try:
+            latest_scores = json.loads(latest.result_data)
+        except (TypeError, ValueError):
+            latest_scores = {}
+        if latest.score is not None:
+            latest_scores["ats_score"] = latest.score
+        percentile_store.refresh_if_stale()
+        latest_percentiles = percentile_store.percentiles(latest_scores)
+
     return DashboardResponse(
         avg_score=round(avg_score, 1) if avg_score is not None else None,
         total_analyses=total_analyses,
         total_resumes=total_resumes,
         recent_analyses=recent_analyses,
+        latest_percentiles=latest_percentiles,
     )
 
 
@@ -4,32 +4,16 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor, black
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
+from app.services.sections import build_section_index
 
-router = APIRouter(prefix="/export", tags=["Export"])
-
-SECTION_HEADINGS = [
-    "professional summary", "summary", "profile", "objective", "career objective",
-    "work experience", "experience", "professional experience", "employment", "work history",
-    "education", "academic background", "academic",
-    "technical skills", "skills", "core competencies", "competencies", "key skills",
-    "certifications", "certificates", "licenses",
-    "projects", "project",
-    "languages",
-    "interests", "activities", "volunteer",
-    "publications", "awards", "honors",
-    "contact", "personal information",
-]
+# reportlab is imported inside the handlers: it is only needed once a PDF is
+# actually exported, not on every cold start.
 
+router = APIRouter(prefix="/export", tags=["Export"])
 
 class ExportRequest(BaseModel):
     content: str
@@ -37,40 +21,22 @@ class ExportRequest(BaseModel):
     format: str = "pdf"
 
 
-def _is_section_heading(line):
-    stripped = line.strip()
-    lower = re.sub(r'[^a-z\s]', '', stripped.lower()).strip()
-    for heading in SECTION_HEADINGS:
-        if lower == heading or lower.startswith(heading):
-            return True
-    return False
-
-
 def _build_resume_story(content, styles):
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
     lines = content.split("\n")
     story = []
 
-    contact_lines = []
-    sections = []
-    current_heading = None
-    current_body = []
-
-    for line in lines:
-        stripped = line.strip()
-        if _is_section_heading(stripped):
-            if current_heading:
-                sections.append((current_heading, "\n".join(current_body).strip()))
-            elif current_body:
-                contact_lines = current_body
-            current_heading = stripped
-            current_body = []
-        else:
-            current_body.append(line)
-
-    if current_heading:
-        sections.append((current_heading, "\n".join(current_body).strip()))
-    elif current_body:
-        contact_lines = current_body
+    index = build_section_index(content)
+    contact_lines = lines[:index[0].start] if index else lines
+    sections = [
+        (span.heading, "\n".join(lines[span.start + 1:span.end]).strip())
+        for span in index
+    ]
 
     header_style = ParagraphStyle(
         "CVName",
@@ -192,6 +158,11 @@ def _build_resume_story(content, styles):
 
 @router.post("/resume")
 def export_resume(request: ExportRequest, current_user: User = Depends(get_current_user)):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate
+
     if request.format == "pdf":
         buffer = BytesIO()
         doc = SimpleDocTemplate(
@@ -216,6 +187,10 @@ def export_resume(request: ExportRequest, current_user: User = Depends(get_curre
 
 @router.post("/cover-letter")
 def export_cover_letter(request: ExportRequest, current_user: User = Depends(get_current_user)):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
     if request.format == "pdf":
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
@@ -236,6 +211,10 @@ def export_report(
     request: ExportRequest,
     current_user: User = Depends(get_current_user),
 ):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
     if request.format == "pdf":
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
@@ -1,4 +1,12 @@
 from fastapi import APIRouter
+from app.services.document_cache import document_cache
+from app.services.extraction_service import extraction_service
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_registry import llm_registry
+from app.services.resume_context import context_stats
+from app.services.score_cache import get_score_memo
+from app.services.single_flight import single_flight
+from app.services.structured_output import structured_output_stats
 
 router = APIRouter()
 
@@ -9,3 +17,17 @@ def health_check():
         "status": "ok",
         "service": "Hire Lens Backend"
     }
+
+
+@router.get("/metrics")
+def metrics():
+    return {
+        "extraction": extraction_service.stats(),
+        "document_cache": document_cache.stats(),
+        "score_cache": get_score_memo().stats(),
+        "llm_cache": get_llm_cache().stats(),
+        "llm_single_flight": single_flight.stats(),
+        "llm_clients": llm_registry.stats(),
+        "resume_context": context_stats.stats(),
+        "structured_output": structured_output_stats.stats(),
+    }
@@ -1,25 +1,28 @@
+import hashlib
 import json
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-import tempfile
-import os
 import uuid
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
 from app.api.v1.chat import SESSION_STORE
-from app.services.resume_parser import (
-    extract_text_from_pdf,
-    extract_text_from_docx,
-    parse_resume_text
+from app.services.resume_parser import ExtractedText, parse_resume_text
+from app.services.document_cache import document_cache
+from app.services.extraction_service import (
+    ExtractionError,
+    ExtractionQueueFull,
+    ExtractionUnavailable,
+    extraction_service,
 )
 from app.schemas.resume import ResumeResponse
-from app.agents.resume_agent import resume_agent
+from app.core.config import settings
 from app.core.security import get_current_user
 from app.core.database import get_db
 from app.models.user import User
 from app.models.resume import Resume
 from app.models.analysis import AnalysisResult
+from app.services.score_percentiles import percentile_store
 from sqlalchemy.orm import Session
 
 
@@ -54,26 +57,84 @@ def list_resumes(
     ]
 
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Signature the first bytes of each accepted file type must carry.
+UPLOAD_MAGIC = {".pdf": b"%PDF-", ".docx": b"PK\x03\x04"}
+
+
+async def _ingest_upload(file: UploadFile) -> str:
+    # One pass in fixed-size chunks: check the file signature, enforce the
+    # size limit and hash as the chunks arrive. Nothing is accumulated, so an
+    # upload costs one chunk of memory here; the bytes stay in the upload's
+    # spool file until the extraction worker reads them.
+    suffix = ".pdf" if file.filename.endswith(".pdf") else ".docx"
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if not size and UPLOAD_MAGIC[suffix] not in chunk[:1024]:
+            raise HTTPException(status_code=415, detail=f"File is not a valid {suffix[1:].upper()}")
+        size += len(chunk)
+        if size > settings.upload_max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Upload too large (max {settings.upload_max_bytes // (1024 * 1024)}MB)",
+            )
+        digest.update(chunk)
+    if not size:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+async def _extract_upload_text(file: UploadFile) -> ExtractedText:
+    # Parsing runs in a worker process; the event loop only waits on it.
+    try:
+        return await extraction_service.extract(file.filename, file.file)
+    except ExtractionQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except ExtractionUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ExtractionError as e:
+        raise HTTPException(status_code=422, detail=f"Could not read document: {e}")
+
+
+def _extraction_report(extracted: Optional[ExtractedText]) -> dict:
+    # How the text was obtained; a cache hit skipped extraction entirely.
+    if extracted is None:
+        return {"mode": "cached", "pages": 0, "layout_pages": 0, "ms": 0.0}
+    return {
+        "mode": extracted.mode,
+        "pages": extracted.pages,
+        "layout_pages": extracted.layout_pages,
+        "ms": round(extracted.seconds * 1000, 1),
+    }
+
+
 @router.post("/upload", response_model=ResumeResponse)
 async def upload_resume(file: UploadFile = File(...)):
     if not file.filename.endswith((".pdf", ".docx")):
         raise HTTPException(status_code=400, detail="Only PDF or DOCX allowed")
 
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp.write(await file.read())
-        file_path = tmp.name
-
-    try:
-        if file.filename.endswith(".pdf"):
-            text = extract_text_from_pdf(file_path)
-        else:
-            text = extract_text_from_docx(file_path)
-
-        structured_resume = parse_resume_text(text)
-        return {"message": "Resume parsed successfully", "data": structured_resume}
+    digest = await _ingest_upload(file)
+    cached = document_cache.get(None, digest)
+    if cached is not None:
+        return {
+            "message": "Resume parsed successfully",
+            "data": cached.parsed_data,
+            "extraction": _extraction_report(None),
+        }
 
-    finally:
-        os.remove(file_path)
+    extracted = await _extract_upload_text(file)
+    structured_resume = parse_resume_text(extracted.text)
+    document_cache.put(None, digest, extracted.text, structured_resume.model_dump())
+    return {
+        "message": "Resume parsed successfully",
+        "data": structured_resume,
+        "extraction": _extraction_report(extracted),
+    }
 
 
 @router.post("/analyze")
@@ -81,7 +142,9 @@ async def analyze_resume_with_agent(resume_data: dict):
     if "resume_text" not in resume_data:
         raise HTTPException(status_code=400, detail="resume_text key is required")
 
-    result = resume_agent.invoke({"resume_text": resume_data["resume_text"]})
+    from app.agents.resume_agent import get_resume_agent
+
+    result = await get_resume_agent().ainvoke({"resume_text": resume_data["resume_text"]})
     return result["output"]
 
 
@@ -94,55 +157,66 @@ async def upload_and_analyze_resume(
     if not file.filename.endswith((".pdf", ".docx")):
         raise HTTPException(status_code=400, detail="Only PDF or DOCX allowed")
 
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        tmp.write(await file.read())
-        file_path = tmp.name
-
-    try:
-        resume_text = (
-            extract_text_from_pdf(file_path)
-            if file.filename.endswith(".pdf")
-            else extract_text_from_docx(file_path)
-        )
+    digest = await _ingest_upload(file)
+    cached = document_cache.get(db, digest)
+    cache_hit = cached is not None and cached.analysis is not None
+    extracted = None
+    if cache_hit:
+        # Same bytes as an earlier upload: reuse its text, sections and
+        # analysis; only the per-user rows below are new.
+        resume_text, parsed_resume, ai_analysis = cached
+    else:
+        if cached is not None:
+            resume_text, parsed_resume = cached.resume_text, cached.parsed_data
+        else:
+            extracted = await _extract_upload_text(file)
+            resume_text = extracted.text
+            parsed_resume = parse_resume_text(resume_text).model_dump()
+        from app.agents.resume_agent import get_resume_agent
 
-        parsed_resume = parse_resume_text(resume_text)
-        agent_result = resume_agent.invoke({"resume_text": resume_text})
+        agent_result = await get_resume_agent().ainvoke({"resume_text": resume_text})
         ai_analysis = agent_result["output"].model_dump()
+        document_cache.put(db, digest, resume_text, parsed_resume, ai_analysis)
 
-        resume_record = Resume(
-            user_id=current_user.id,
-            original_filename=file.filename,
-            resume_text=resume_text,
-            parsed_data=json.dumps(parsed_resume.model_dump() if hasattr(parsed_resume, "model_dump") else parsed_resume),
-        )
-        db.add(resume_record)
-        db.flush()
-
-        analysis = AnalysisResult(
-            resume_id=resume_record.id,
-            analysis_type="resume_analysis",
-            result_data=json.dumps(ai_analysis),
-            score=ai_analysis.get("ats_score"),
-        )
-        db.add(analysis)
-
-        current_user.analyses_count = (current_user.analyses_count or 0) + 1
-        db.commit()
-        db.refresh(resume_record)
-
-        session_id = str(uuid.uuid4())
-        SESSION_STORE[session_id] = {
-            "analysis": ai_analysis,
-            "resume_text": resume_text,
-            "chat_history": []
-        }
+    resume_record = Resume(
+        user_id=current_user.id,
+        original_filename=file.filename,
+        resume_text=resume_text,
+        parsed_data=json.dumps(parsed_resume),
+    )
+    db.add(resume_record)
+    db.flush()
+
+    analysis = AnalysisResult(
+        resume_id=resume_record.id,
+        analysis_type="resume_analysis",
+        result_data=json.dumps(ai_analysis),
+        score=ai_analysis.get("ats_score"),
+    )
+    db.add(analysis)
+
+    current_user.analyses_count = (current_user.analyses_count or 0) + 1
+    db.commit()
+    db.refresh(resume_record)
+
+    percentile_store.refresh_if_stale()
+
+    session_id = str(uuid.uuid4())
+    SESSION_STORE[session_id] = {
+        "analysis": ai_analysis,
+        "resume_text": resume_text,
+        "resume_data": parsed_resume,
+        "chat_history": []
+    }
+
+    return {
+        "message": "Resume uploaded & analyzed successfully",
+        "session_id": session_id,
+        "resume_id": str(resume_record.id),
+        "parsed_resume": parsed_resume,
+        "ai_analysis": ai_analysis,
+        "percentiles": percentile_store.percentiles(ai_analysis),
+        "cache_hit": cache_hit,
+        "extraction": _extraction_report(extracted),
+    }
 
-        return {
-            "message": "Resume uploaded & analyzed successfully",
-            "session_id": session_id,
-            "resume_id": str(resume_record.id),
-            "parsed_resume": parsed_resume,
-            "ai_analysis": ai_analysis,
-        }
-    finally:
-        os.remove(file_path)
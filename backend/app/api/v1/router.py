@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import health, resume, chat, agent, auth, export, stream, subscriptions, dashboard
+from app.api.v1 import health, resume, chat, agent, auth, export, stream, subscriptions, dashboard, ats
 
 api_router = APIRouter()
 
@@ -12,3 +12,4 @@ api_router.include_router(export.router, tags=["Export"])
 api_router.include_router(stream.router, tags=["Streaming"])
 api_router.include_router(subscriptions.router, tags=["Subscriptions"])
 api_router.include_router(dashboard.router, tags=["Dashboard"])
+api_router.include_router(ats.router, tags=["ATS"])
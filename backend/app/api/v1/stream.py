@@ -1,6 +1,7 @@
+import json
+from typing import Literal
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sse_starlette.sse import EventSourceResponse
 from app.core.security import get_current_user
 from app.models.user import User
 from app.services.streaming import stream_chat_response
@@ -15,11 +16,24 @@ class StreamRequest(BaseModel):
     system_prompt: str = ""
 
 
+class StreamAgentRequest(BaseModel):
+    session_id: str
+    intent: Literal["cover_letter", "enhance", "interview_prep"]
+    resume_text: str = ""
+    job_description: str = ""
+
+
+# analysis_results entry each streamed intent fills, as its graph node does
+_RESULT_KEYS = {"cover_letter": "cover_letter", "interview_prep": "interview_prep"}
+
+
 @router.post("/chat")
 async def stream_chat(
     request: StreamRequest,
     current_user: User = Depends(get_current_user),
 ):
+    from sse_starlette.sse import EventSourceResponse
+
     session = SESSION_STORE.get(request.session_id, {})
     analysis = session.get("analysis_results", {})
 
@@ -39,3 +53,57 @@ Rules:
     return EventSourceResponse(
         stream_chat_response(system_prompt, chat_history, request.message)
     )
+
+
+def _agent_stream(intent: str):
+    # The agents (LangChain) load on the first request.
+    if intent == "cover_letter":
+        from app.agents.cover_letter_agent import stream_cover_letter
+        return stream_cover_letter
+    if intent == "interview_prep":
+        from app.agents.interview_agent import stream_interview_prep
+        return stream_interview_prep
+    from app.agents.resume_enhance_agent import stream_enhance_resume
+    return stream_enhance_resume
+
+
+@router.post("/agent")
+async def stream_agent(
+    request: StreamAgentRequest,
+    current_user: User = Depends(get_current_user),
+):
+    # Server-sent events: a "field" event ({"path", "value"}) for each part of
+    # the answer as soon as the model has written it, then one "result" event
+    # with the validated output, or an "error" event.
+    from sse_starlette.sse import EventSourceResponse
+
+    session = SESSION_STORE.get(request.session_id, {})
+    state = {
+        "resume_text": request.resume_text or session.get("resume_text", ""),
+        "resume_data": session.get("resume_data", {}),
+        "job_description": request.job_description or session.get("job_description", ""),
+        "session_id": request.session_id,
+    }
+    stream = _agent_stream(request.intent)
+
+    async def events():
+        async for event in stream(state):
+            if event.kind == "field":
+                yield {"event": "field", "data": json.dumps({"path": event.path, "value": event.value})}
+            elif event.kind == "error":
+                yield {"event": "error", "data": json.dumps({"detail": event.value})}
+            else:
+                key = _RESULT_KEYS.get(request.intent)
+                if key:
+                    current = SESSION_STORE.get(request.session_id, {})
+                    SESSION_STORE[request.session_id] = {
+                        **current,
+                        "resume_text": state["resume_text"],
+                        "job_description": state["job_description"],
+                        "analysis_results": {**current.get("analysis_results", {}), key: event.data},
+                    }
+                output = event.value
+                data = output.model_dump_json() if isinstance(output, BaseModel) else json.dumps(output)
+                yield {"event": "result", "data": data}
+
+    return EventSourceResponse(events())
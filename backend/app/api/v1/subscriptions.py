@@ -1,14 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-import stripe
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User, SubscriptionTier
 
-stripe.api_key = settings.stripe_secret_key
-
 router = APIRouter(prefix="/subscriptions", tags=["Subscriptions"])
 
 
@@ -16,11 +13,20 @@ class CreateCheckoutResponse(BaseModel):
     url: str
 
 
+def _stripe():
+    # Imported on first use: the SDK is heavy and most cold starts never
+    # touch billing.
+    import stripe
+    stripe.api_key = settings.stripe_secret_key
+    return stripe
+
+
 @router.post("/create-checkout", response_model=CreateCheckoutResponse)
 def create_checkout_session(current_user: User = Depends(get_current_user)):
     if not settings.stripe_secret_key:
         raise HTTPException(status_code=501, detail="Stripe not configured")
 
+    stripe = _stripe()
     try:
         checkout_session = stripe.checkout.Session.create(
             customer_email=current_user.email,
@@ -44,6 +50,7 @@ async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
 
+    stripe = _stripe()
     try:
         event = stripe.Webhook.construct_event(payload, sig_header, settings.stripe_webhook_secret)
     except ValueError:
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Dict
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,6 +21,57 @@ class Settings(BaseSettings):
 
     redis_url: str = "redis://localhost:6379/0"
 
+    skills_taxonomy_path: str = ""
+
+    process_pool_workers: int = 0
+    ats_batch_max_items: int = 5000
+    ats_batch_chunk_size: int = 16
+    ats_line_cache_size: int = 20000
+
+    score_cache_backend: str = "memory"
+    score_cache_max_entries: int = 10000
+    score_cache_ttl_seconds: int = 86400
+
+    percentile_refresh_seconds: int = 30
+
+    pdf_max_pages: int = 30
+    pdf_max_chars: int = 200000
+    pdf_parallel_min_pages: int = 16
+    pdf_pages_per_task: int = 4
+    # "auto" (fast, escalating to layout per page when needed), "fast" or "layout"
+    pdf_text_mode: str = "auto"
+    docx_max_chars: int = 200000
+
+    upload_max_bytes: int = 10 * 1024 * 1024
+
+    extraction_workers: int = 2
+    extraction_queue_size: int = 8
+    extraction_timeout_seconds: float = 20.0
+
+    document_cache_max_entries: int = 512
+
+    llm_cache_backend: str = "memory"
+    llm_cache_max_entries: int = 2048
+    # node=seconds; a node at 0 or not listed always calls the model, and so
+    # does one whose model samples (temperature above 0 and no fixed seed)
+    llm_cache_ttls: str = (
+        "ats=86400,job_match=0,analyze=0,career_path=0,interview_prep=0,"
+        "chat=0,cover_letter=0,enhance=0,mock_interview=0"
+    )
+    # Identical model calls in flight at once share one upstream request
+    llm_single_flight: bool = True
+
+    # Resume token budget per agent prompt (node=tokens); 0 or unlisted: no cut.
+    # enhance rewrites the whole resume, so it is never cut.
+    resume_context_budgets: str = (
+        "analyze=4000,ats=4000,job_match=3000,career_path=3000,interview_prep=2500,"
+        "cover_letter=3000"
+    )
+
+    # Per-branch limit for the full_report intent; a slow branch is reported
+    # as timed out instead of holding up the others' results.
+    full_report_branch_timeout_seconds: float = 45.0
+
     cors_origins: str = "http://localhost:5173,http://localhost:3000,https://hire-lensz.vercel.app"
 
     model_config = SettingsConfigDict(
@@ -27,3 +81,14 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+
+@lru_cache(maxsize=8)
+def parse_node_map(spec: str) -> Dict[str, int]:
+    # Per-node settings like LLM_CACHE_TTLS: "ats=86400,chat=0" -> {"ats": 86400, "chat": 0}
+    values = {}
+    for item in spec.split(","):
+        node, _, value = item.partition("=")
+        if node.strip():
+            values[node.strip()] = int(value or 0)
+    return values
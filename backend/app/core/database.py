@@ -7,6 +7,14 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def init_db():
+    # Creates any missing tables. Deployments run `alembic upgrade head`
+    # instead; this is for local development (run.py), never the serving
+    # process's startup.
+    import app.models  # noqa: F401  (registers every table on Base)
+    Base.metadata.create_all(bind=engine)
+
+
 def get_db():
     db = SessionLocal()
     try:
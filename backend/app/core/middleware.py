@@ -0,0 +1,43 @@
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload too large (max {max_bytes // (1024 * 1024)}MB)")
+
+
+class UploadSizeLimitMiddleware:
+    # Enforces the upload limit while the request body streams in, before
+    # the multipart parser has spooled all of it. A declared Content-Length
+    # over the limit is refused without reading anything; a body that turns
+    # out larger is cut off at the first chunk past the limit.
+    def __init__(self, app, max_bytes: int, path_prefix: str):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > self.max_bytes:
+            error = _too_large(self.max_bytes)
+            await JSONResponse({"detail": error.detail}, status_code=error.status_code)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside body parsing; FastAPI passes HTTPException
+                    # through to its handler, which answers 413.
+                    raise _too_large(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
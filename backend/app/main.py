@@ -7,18 +7,22 @@ from fastapi.middleware.cors import CORSMiddleware
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.middleware import UploadSizeLimitMiddleware
 from app.api.v1.router import api_router
+from app.services.extraction_service import extraction_service
+from app.services.process_pool import shutdown_process_pool
+from app.services.score_percentiles import percentile_store
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    try:
-        if not os.getenv("VERCEL"):
-            Base.metadata.create_all(bind=engine)
-    except Exception:
-        pass
+    # No schema work here: tables come from `alembic upgrade head` (or
+    # init_db() via run.py locally), so a cold start goes straight to serving.
+    # Score percentiles load on a background thread meanwhile.
+    percentile_store.refresh_if_stale()
     yield
+    extraction_service.shutdown()
+    shutdown_process_pool()
 
 
 def create_app() -> FastAPI:
@@ -29,6 +33,15 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Multipart framing adds a little on top of the file itself; the exact
+    # per-file limit is enforced again while the upload is hashed. Added
+    # before CORS so CORS wraps it and a browser can read the 413.
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        max_bytes=settings.upload_max_bytes + 64 * 1024,
+        path_prefix="/api/v1/resume/upload",
+    )
+
     cors_origins = [
         "http://localhost:5173",
         "http://localhost:3000",
@@ -2,3 +2,4 @@ from app.models.user import User
 from app.models.resume import Resume, ResumeVersion
 from app.models.chat import ChatSession, ChatMessage
 from app.models.analysis import AnalysisResult, JobApplication
+from app.models.document_cache import DocumentCacheEntry
@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Text, DateTime, Integer
+from app.core.database import Base
+
+
+class DocumentCacheEntry(Base):
+    __tablename__ = "document_cache"
+
+    content_hash = Column(String(64), primary_key=True)
+    resume_text = Column(Text, nullable=False)
+    parsed_data = Column(Text, nullable=False)
+    analysis_data = Column(Text, nullable=True)
+    scorer_version = Column(String, nullable=True)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
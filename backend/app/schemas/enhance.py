@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class EnhanceOutput(BaseModel):
+    enhanced_text: str
+    changes_summary: str
+    keywords_added: List[str]
@@ -2,6 +2,13 @@ from pydantic import BaseModel
 from typing import List, Optional
 
 
+class SectionIndexEntry(BaseModel):
+    section: str
+    heading: str
+    start: int
+    end: int
+
+
 class ResumeSections(BaseModel):
     name: Optional[str] = None
     email: Optional[str] = None
@@ -13,7 +20,19 @@ class ResumeSections(BaseModel):
     education: List[str] = []
     projects: List[str] = []
 
+    # Heading -> line span over resume_text.split("\n"), see app.services.sections
+    section_index: List[SectionIndexEntry] = []
+
+
+class ExtractionInfo(BaseModel):
+    # "fast", "layout" or "docx"; "cached" when the text came from the cache
+    mode: str
+    pages: int = 0
+    layout_pages: int = 0
+    ms: float = 0.0
+
 
 class ResumeResponse(BaseModel):
     message: str
     data: ResumeSections
+    extraction: Optional[ExtractionInfo] = None
@@ -1,5 +1,36 @@
 import re
-from typing import List, Dict
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import List, Dict, FrozenSet, Iterable, Iterator, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.process_pool import get_process_pool, pool_size, reset_process_pool
+from app.services.sections import classify_heading
+from app.services.skill_matcher import get_skill_matcher
+
+# Bump whenever a rule change alters scores, so cached scores keyed on text
+# (app.services.score_cache) are not served across versions.
+SCORER_VERSION = "5"
+
+# The keyword score bands (15+ skills -> 100, ...) were calibrated on this
+# vocabulary, the original 67 keywords. The taxonomy knows far more skills;
+# counting all of them would push ordinary resumes into the top bands.
+KEYWORD_SCORE_SKILLS = frozenset({
+    "python", "java", "javascript", "typescript", "go", "rust", "c++", "c#",
+    "sql", "nosql", "mongodb", "postgresql", "mysql", "redis",
+    "react", "angular", "vue", "node", "django", "flask", "fastapi",
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins",
+    "git", "linux", "api", "rest", "graphql", "machine learning", "deep learning",
+    "data science", "data engineering", "analytics", "nlp", "computer vision",
+    "agile", "scrum", "ci/cd", "devops", "testing", "automation",
+    "tensorflow", "pytorch", "pandas", "numpy", "spark", "hadoop",
+    "html", "css", "sass", "webpack", "babel", "redux",
+    "tableau", "power bi", "looker", "airflow", "kafka",
+    "microservices", "serverless", "saas", "restful",
+})
 
 ACTION_VERBS = {
     "achieved", "accelerated", "administered", "advised", "allocated", "analyzed",
@@ -23,30 +54,6 @@ ACTION_VERBS = {
     "won", "wrote",
 }
 
-STANDARD_SECTION_KEYWORDS = [
-    "experience", "work experience", "employment", "professional experience",
-    "education", "academic", "academic background",
-    "skills", "technical skills", "core competencies", "expertise",
-    "projects", "professional projects",
-    "summary", "professional summary", "profile", "objective",
-    "certifications", "certificates",
-    "publications", "awards", "honors", "volunteer", "languages",
-]
-
-TECHNICAL_KEYWORDS = {
-    "python", "java", "javascript", "typescript", "go", "rust", "c++", "c#",
-    "sql", "nosql", "mongodb", "postgresql", "mysql", "redis",
-    "react", "angular", "vue", "node", "django", "flask", "fastapi",
-    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins",
-    "git", "linux", "api", "rest", "graphql", "machine learning", "deep learning",
-    "data science", "data engineering", "analytics", "nlp", "computer vision",
-    "agile", "scrum", "ci/cd", "devops", "testing", "automation",
-    "tensorflow", "pytorch", "pandas", "numpy", "spark", "hadoop",
-    "html", "css", "sass", "webpack", "babel", "redux",
-    "tableau", "power bi", "looker", "airflow", "kafka",
-    "microservices", "serverless", "saas", "restful",
-}
-
 QUANTIFICATION_PATTERNS = [
     r'\d+%',
     r'\$\s*\d+(?:[kKmMbB]|,\d{3})?',
@@ -61,72 +68,170 @@ QUANTIFICATION_PATTERNS = [
 ]
 
 
+BULLET_CHARS = ("•", "-", "*", "·", "→", "➢", "◆", "▸")
+
+_QUANTIFIED_RES = tuple(re.compile(pat, re.IGNORECASE) for pat in QUANTIFICATION_PATTERNS)
+_PHONE_RE = re.compile(r"\+?\d[\d\s\-().]{7,}\d")
+# Every quantification and phone pattern needs a digit, so lines without one
+# skip both searches.
+_DIGIT_RE = re.compile(r"\d")
+
+
+class LineFeatures(NamedTuple):
+    blank: bool
+    bullet: bool
+    word_count: int
+    quantified: bool
+    action_verb: bool
+    table_like: bool
+    email: bool
+    phone: bool
+    linkedin: bool
+    github: bool
+    portfolio: bool
+    section: Optional[str]
+    skills: FrozenSet[str]
+
+
+def _blank_line_features(line: str) -> LineFeatures:
+    return LineFeatures(
+        blank=True, bullet=False, word_count=0, quantified=False,
+        action_verb=False, table_like=line.count("\t") > 1, email=False,
+        phone=False, linkedin=False, github=False, portfolio=False,
+        section=None, skills=frozenset(),
+    )
+
+
+def extract_line_features(line: str) -> LineFeatures:
+    stripped = line.strip()
+    if not stripped:
+        return _blank_line_features(line)
+
+    lower = stripped.lower()
+    words = lower.split()
+    has_digit = _DIGIT_RE.search(stripped) is not None
+    return LineFeatures(
+        blank=False,
+        bullet=stripped[0] in BULLET_CHARS,
+        word_count=len(words),
+        quantified=has_digit and any(p.search(line) for p in _QUANTIFIED_RES),
+        action_verb=not ACTION_VERBS.isdisjoint(words),
+        table_like="|" in line or line.count("\t") > 1,
+        email="@" in stripped,
+        phone=has_digit and _PHONE_RE.search(stripped) is not None,
+        linkedin="linkedin" in lower,
+        github="github" in lower,
+        portfolio="portfolio" in lower,
+        section=classify_heading(stripped),
+        # Skill terms never span a line break, so per-line matching finds the
+        # same skills as scanning the whole text.
+        skills=frozenset(get_skill_matcher().skill_ids(stripped)),
+    )
+
+
+class _LineFeatureCache:
+    # Bounded LRU of line content -> LineFeatures. Features depend only on the
+    # line itself, so any line seen before (in this or another resume) is
+    # reused instead of re-extracted.
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, LineFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_many(self, lines: List[str]) -> List[Optional[LineFeatures]]:
+        with self._lock:
+            found = []
+            for line in lines:
+                f = self._data.get(line)
+                if f is not None:
+                    self._data.move_to_end(line)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                found.append(f)
+            return found
+
+    def put_many(self, items: Iterable[Tuple[str, LineFeatures]]) -> None:
+        with self._lock:
+            for line, f in items:
+                self._data[line] = f
+                self._data.move_to_end(line)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+line_feature_cache = _LineFeatureCache(settings.ats_line_cache_size)
+
+
+def _features_for_lines(lines: List[str], known: Optional[Dict[str, LineFeatures]] = None) -> List[LineFeatures]:
+    features: List[Optional[LineFeatures]] = [known.get(l) for l in lines] if known else [None] * len(lines)
+    missing = [i for i, f in enumerate(features) if f is None]
+    if missing:
+        cached = line_feature_cache.get_many([lines[i] for i in missing])
+        computed = []
+        for i, f in zip(missing, cached):
+            if f is None:
+                f = extract_line_features(lines[i])
+                computed.append((lines[i], f))
+            features[i] = f
+        line_feature_cache.put_many(computed)
+    return features
+
+
+def extract_features(text: str) -> List[LineFeatures]:
+    return _features_for_lines(text.split("\n"))
+
+
 def detect_sections(lines: List[str]) -> List[str]:
     detected = []
     for line in lines:
-        lower = line.lower().strip().rstrip(":")
-        for kw in STANDARD_SECTION_KEYWORDS:
-            if lower == kw or lower.startswith(kw + ":"):
-                detected.append(kw)
-                break
+        section = classify_heading(line)
+        if section:
+            detected.append(section)
     return detected
 
 
 def count_quantified_achievements(text: str) -> int:
-    count = 0
-    for line in text.split("\n"):
-        for pat in QUANTIFICATION_PATTERNS:
-            if re.search(pat, line, re.IGNORECASE):
-                count += 1
-                break
-    return count
+    return sum(1 for f in extract_features(text) if f.quantified)
 
 
 def count_action_verbs(text: str) -> int:
-    count = 0
-    for line in text.split("\n"):
-        words = set(line.lower().split())
-        if words & ACTION_VERBS:
-            count += 1
-    return count
+    return sum(1 for f in extract_features(text) if f.action_verb)
 
 
 def count_bullet_points(text: str) -> int:
-    count = 0
-    for line in text.split("\n"):
-        stripped = line.strip()
-        if stripped and stripped[0] in ("•", "-", "*", "·", "→", "➢", "◆", "▸"):
-            count += 1
-    return count
-
-
-def has_linkedin(lines: List[str]) -> bool:
-    return any("linkedin" in l.lower() for l in lines)
-
-
-def has_github(lines: List[str]) -> bool:
-    return any("github" in l.lower() for l in lines)
-
-
-def has_portfolio(lines: List[str]) -> bool:
-    return any("portfolio" in l.lower() for l in lines)
+    return sum(1 for f in extract_features(text) if f.bullet)
 
 
 def count_technical_skills(text: str) -> int:
-    lower = text.lower()
-    return sum(1 for kw in TECHNICAL_KEYWORDS if kw in lower)
+    return len(get_skill_matcher().skill_ids(text))
 
 
 def estimate_total_lines(text: str) -> int:
-    return len([l for l in text.split("\n") if l.strip()])
+    return sum(1 for f in extract_features(text) if not f.blank)
 
 
-def compute_format_score(text: str, detected_sections: List[str]) -> int:
+# ── Sub-scores, all derived from the per-line feature table ──
+def _detected_sections(features: List[LineFeatures]) -> List[str]:
+    return [f.section for f in features if f.section]
+
+
+def compute_format_score(features: List[LineFeatures]) -> int:
     score = 100
 
     required = {"experience", "education", "skills"}
     found = set()
-    for s in detected_sections:
+    for s in _detected_sections(features):
         for r in required:
             if r in s:
                 found.add(r)
@@ -135,22 +240,24 @@ def compute_format_score(text: str, detected_sections: List[str]) -> int:
     missing_penalty = len(missing) * 12
     score -= missing_penalty
 
-    bullet_count = count_bullet_points(text)
+    bullet_count = sum(1 for f in features if f.bullet)
     if bullet_count == 0:
         score -= 25
     elif bullet_count < 5:
         score -= 10
 
-    lines = text.split("\n")
-    table_like = sum(1 for l in lines if "|" in l or l.count("\t") > 1)
+    table_like = sum(1 for f in features if f.table_like)
     if table_like > 3:
         score -= 15
 
     return max(0, min(100, score))
 
 
-def compute_keyword_score(text: str, detected_sections: List[str]) -> int:
-    skill_count = count_technical_skills(text)
+def compute_keyword_score(features: List[LineFeatures]) -> int:
+    skills: Set[str] = set()
+    for f in features:
+        skills |= f.skills
+    skill_count = len(skills & KEYWORD_SCORE_SKILLS)
     if skill_count >= 15:
         return 100
     elif skill_count >= 10:
@@ -167,9 +274,9 @@ def compute_keyword_score(text: str, detected_sections: List[str]) -> int:
         return 10
 
 
-def compute_content_score(text: str) -> int:
-    quantified = count_quantified_achievements(text)
-    action_verbs = count_action_verbs(text)
+def compute_content_score(features: List[LineFeatures]) -> int:
+    quantified = sum(1 for f in features if f.quantified)
+    action_verbs = sum(1 for f in features if f.action_verb)
 
     score = 50
     score += min(quantified * 8, 30)
@@ -178,40 +285,38 @@ def compute_content_score(text: str) -> int:
     return max(0, min(100, score))
 
 
-def compute_completeness_score(lines: List[str], text: str) -> int:
+def compute_completeness_score(features: List[LineFeatures]) -> int:
     score = 0
 
-    if any("@" in l for l in lines):
+    if any(f.email for f in features):
         score += 15
-    if any(re.search(r"\+?\d[\d\s\-().]{7,}\d", l) for l in lines):
+    if any(f.phone for f in features):
         score += 15
-    if has_linkedin(lines):
+    if any(f.linkedin for f in features):
         score += 10
-    if has_github(lines) or has_portfolio(lines):
+    if any(f.github or f.portfolio for f in features):
         score += 10
 
-    detected = set(detect_sections(lines))
+    detected = set(_detected_sections(features))
     for section in ("experience", "education", "skills"):
         if any(section in s for s in detected):
             score += 15
-        else:
-            score += 0
 
-    total = estimate_total_lines(text)
+    total = sum(1 for f in features if not f.blank)
     if total < 20:
         score -= 10
 
     return max(0, min(100, score))
 
 
-def compute_readability_score(text: str) -> int:
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
+def compute_readability_score(features: List[LineFeatures]) -> int:
+    lines = [f for f in features if not f.blank]
     if not lines:
         return 50
 
     total = len(lines)
 
-    bullet_count = count_bullet_points(text)
+    bullet_count = sum(1 for f in lines if f.bullet)
     bullet_ratio = bullet_count / max(total, 1)
     if bullet_ratio >= 0.3:
         bullet_score = 25
@@ -220,21 +325,20 @@ def compute_readability_score(text: str) -> int:
     else:
         bullet_score = 10
 
-    long_lines = sum(1 for l in lines if len(l.split()) > 30)
+    long_lines = sum(1 for f in lines if f.word_count > 30)
     long_ratio = long_lines / total
     length_score = 25 - int(long_ratio * 25)
     length_score = max(0, length_score)
 
-    very_short_lines = sum(1 for l in lines if len(l.split()) < 3)
+    very_short_lines = sum(1 for f in lines if f.word_count < 3)
     if very_short_lines > total * 0.3:
         density_score = 15
     else:
         density_score = 25
 
-    short_lines = total
-    if short_lines > 200:
+    if total > 200:
         size_score = 15
-    elif short_lines > 120:
+    elif total > 120:
         size_score = 20
     else:
         size_score = 25
@@ -243,15 +347,12 @@ def compute_readability_score(text: str) -> int:
     return max(0, min(100, score))
 
 
-def compute_ats_scores(text: str) -> Dict:
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
-    detected_sections = detect_sections(lines)
-
-    format_score = compute_format_score(text, detected_sections)
-    keyword_score = compute_keyword_score(text, detected_sections)
-    content_score = compute_content_score(text)
-    completeness_score = compute_completeness_score(lines, text)
-    readability_score = compute_readability_score(text)
+def compute_scores_from_features(features: List[LineFeatures]) -> Dict:
+    format_score = compute_format_score(features)
+    keyword_score = compute_keyword_score(features)
+    content_score = compute_content_score(features)
+    completeness_score = compute_completeness_score(features)
+    readability_score = compute_readability_score(features)
 
     ats_score = round(
         format_score * 0.20
@@ -269,3 +370,95 @@ def compute_ats_scores(text: str) -> Dict:
         "readability_score": readability_score,
         "ats_score": ats_score,
     }
+
+
+def compute_ats_scores(text: str) -> Dict:
+    return compute_scores_from_features(extract_features(text))
+
+
+# ── Incremental re-scoring of edited resumes ──
+class ATSScoreHandle(NamedTuple):
+    lines: List[str]
+    features: List[LineFeatures]
+    scores: Dict
+
+
+def score_with_handle(text: str) -> ATSScoreHandle:
+    lines = text.split("\n")
+    features = _features_for_lines(lines)
+    return ATSScoreHandle(lines, features, compute_scores_from_features(features))
+
+
+def rescore(previous: Optional[ATSScoreHandle], new_text: str) -> ATSScoreHandle:
+    # Lines unchanged since the previous version (wherever they moved to) reuse
+    # its features directly, so this does not depend on the shared LRU still
+    # holding them; only new or edited lines are extracted.
+    if previous is None:
+        return score_with_handle(new_text)
+    known = dict(zip(previous.lines, previous.features))
+    lines = new_text.split("\n")
+    features = _features_for_lines(lines, known)
+    return ATSScoreHandle(lines, features, compute_scores_from_features(features))
+
+
+# ── Batch scoring across the process pool ──
+def _score_chunk(chunk: List[Tuple[int, str]]) -> List[Dict]:
+    results = []
+    for index, text in chunk:
+        try:
+            results.append({"index": index, "scores": compute_ats_scores(text)})
+        except Exception as e:
+            results.append({"index": index, "error": str(e)})
+    return results
+
+
+def compute_ats_scores_batch(
+    texts: Iterable[str],
+    chunk_size: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+) -> Iterator[Dict]:
+    # Yields {"index", "scores"} or {"index", "error"} per input, in completion
+    # order. Inputs are pulled lazily and at most max_in_flight chunks are
+    # queued, so memory stays bounded however long the input is.
+    chunk_size = chunk_size or settings.ats_batch_chunk_size
+    max_in_flight = max_in_flight or pool_size() * 2
+    items = enumerate(texts)
+    pending = {}
+
+    def submit_next() -> bool:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return False
+        pool = get_process_pool()
+        try:
+            future = pool.submit(_score_chunk, chunk)
+        except BrokenProcessPool:
+            reset_process_pool(pool)
+            pool = get_process_pool()
+            future = pool.submit(_score_chunk, chunk)
+        pending[future] = (chunk, pool)
+        return True
+
+    try:
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk, pool = pending.pop(future)
+                try:
+                    yield from future.result()
+                except BrokenProcessPool as e:
+                    # A worker died mid-chunk; fail this chunk, keep the batch going.
+                    reset_process_pool(pool)
+                    for index, _ in chunk:
+                        yield {"index": index, "error": f"Scoring worker crashed: {e}"}
+                except Exception as e:
+                    for index, _ in chunk:
+                        yield {"index": index, "error": str(e)}
+                submit_next()
+    finally:
+        # The consumer may stop early (client disconnect); drop queued work.
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,131 @@
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.document_cache import DocumentCacheEntry
+from app.services.ats_scorer import SCORER_VERSION
+
+
+class CachedDocument(NamedTuple):
+    resume_text: str
+    parsed_data: Dict
+    # None until the document has been analysed (or the scorer changed since).
+    analysis: Optional[Dict]
+
+
+class DocumentCache:
+    # Extraction, parsing and the last analysis of an uploaded file, keyed by
+    # the sha256 of its bytes. A per-worker LRU sits in front of the
+    # document_cache table, which is shared across workers and restarts.
+    # Database errors only cost the cache, never the upload.
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, CachedDocument]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _remember(self, digest: str, doc: CachedDocument) -> None:
+        with self._lock:
+            self._data[digest] = doc
+            self._data.move_to_end(digest)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get(self, db: Optional[Session], digest: str) -> Optional[CachedDocument]:
+        with self._lock:
+            doc = self._data.get(digest)
+            if doc is not None:
+                self._data.move_to_end(digest)
+        # A local entry without an analysis may be behind the shared table.
+        if doc is not None and (doc.analysis is not None or db is None):
+            self.memory_hits += 1
+            return doc
+
+        row = None
+        if db is not None:
+            try:
+                with db.begin_nested():
+                    row = db.get(DocumentCacheEntry, digest)
+                    if row is not None:
+                        row.hit_count = (row.hit_count or 0) + 1
+                        row.last_used_at = datetime.utcnow()
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Document cache read failed: {e}")
+                row = None
+        if row is None:
+            if doc is not None:
+                self.memory_hits += 1
+                return doc
+            self.misses += 1
+            return None
+
+        self.db_hits += 1
+        analysis = None
+        if row.analysis_data and row.scorer_version == SCORER_VERSION:
+            analysis = json.loads(row.analysis_data)
+        doc = CachedDocument(row.resume_text, json.loads(row.parsed_data), analysis)
+        self._remember(digest, doc)
+        return doc
+
+    def put(
+        self,
+        db: Optional[Session],
+        digest: str,
+        resume_text: str,
+        parsed_data: Dict,
+        analysis: Optional[Dict] = None,
+    ) -> None:
+        if analysis is None:
+            # A parse-only upload must not drop an analysis cached earlier.
+            with self._lock:
+                known = self._data.get(digest)
+            analysis = known.analysis if known is not None else None
+        self._remember(digest, CachedDocument(resume_text, parsed_data, analysis))
+        if db is None:
+            return
+        try:
+            # Savepoint: a failed cache write must not roll back the caller's
+            # Resume/AnalysisResult rows in the same transaction.
+            with db.begin_nested():
+                row = db.get(DocumentCacheEntry, digest)
+                if row is None:
+                    row = DocumentCacheEntry(content_hash=digest, hit_count=0)
+                    db.add(row)
+                row.resume_text = resume_text
+                row.parsed_data = json.dumps(parsed_data)
+                if analysis is not None:
+                    row.analysis_data = json.dumps(analysis)
+                    row.scorer_version = SCORER_VERSION
+                row.last_used_at = datetime.utcnow()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Document cache write failed: {e}")
+
+    def stats(self) -> Dict:
+        hits = self.memory_hits + self.db_hits
+        total = hits + self.misses
+        return {
+            "entries": len(self._data),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+document_cache = DocumentCache(settings.document_cache_max_entries)
@@ -0,0 +1,197 @@
+import asyncio
+import io
+import multiprocessing
+import time
+from collections import deque
+from typing import BinaryIO, Deque, Dict, Optional, Set, Union
+
+from app.core.config import settings
+from app.services.resume_parser import ExtractedText, extract_document
+
+# Children come from a forkserver that has already imported the parsers: no
+# fork of the threaded server process, and no per-job import cost. The PDF
+# libraries load lazily in the server, so they are named here explicitly.
+_mp = multiprocessing.get_context("forkserver")
+_mp.set_forkserver_preload(["app.services.resume_parser", "app.services.pdf_fast_text", "pdfplumber"])
+
+
+class ExtractionQueueFull(Exception):
+    pass
+
+
+class ExtractionUnavailable(Exception):
+    # Timed out or the worker died; the document itself may be fine.
+    pass
+
+
+class ExtractionError(Exception):
+    # The document could not be read.
+    pass
+
+
+_FEED_CHUNK_SIZE = 64 * 1024
+
+
+def _feed(conn, source: BinaryIO) -> None:
+    # Runs on a thread: copies the document into the worker one chunk at a
+    # time, so the server never holds the whole file in memory.
+    try:
+        while True:
+            chunk = source.read(_FEED_CHUNK_SIZE)
+            if not chunk:
+                break
+            conn.send_bytes(chunk)
+        conn.send_bytes(b"")
+    except OSError:
+        # The worker is gone (killed on timeout); the result side reports it.
+        pass
+    finally:
+        conn.close()
+
+
+def _run_job(conn, source_conn, filename: str) -> None:
+    try:
+        chunks = []
+        while True:
+            chunk = source_conn.recv_bytes()
+            if not chunk:
+                break
+            chunks.append(chunk)
+        source_conn.close()
+        # Already off the server process; no nested pool per job.
+        conn.send(("ok", extract_document(filename, b"".join(chunks), parallel=False)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class ExtractionService:
+    # Uploaded documents are parsed in a child process per job, never on the
+    # event loop. At most `workers` jobs run at once and `queue_size` more may
+    # wait for a slot; further submissions are rejected instead of piling up.
+    # A job past the timeout is killed, which a shared pool cannot do.
+    def __init__(self, workers: int, queue_size: int, timeout_seconds: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout_seconds = timeout_seconds
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._procs: Set = set()
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    async def extract(self, filename: str, source: Union[bytes, BinaryIO]) -> ExtractedText:
+        if self.waiting + self.running >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise ExtractionQueueFull("Too many documents are being processed, try again shortly")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            extracted = await self._run(filename, io.BytesIO(source) if isinstance(source, bytes) else source)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self._slots.release()
+        self.completed += 1
+        self._latencies.append(time.monotonic() - started)
+        return extracted
+
+    async def _run(self, filename: str, source: BinaryIO) -> ExtractedText:
+        loop = asyncio.get_running_loop()
+        recv_conn, send_conn = _mp.Pipe(duplex=False)
+        source_recv, source_send = _mp.Pipe(duplex=False)
+        proc = _mp.Process(target=_run_job, args=(send_conn, source_recv, filename), daemon=True)
+        # The first start also boots the forkserver; keep that off the loop.
+        await loop.run_in_executor(None, proc.start)
+        send_conn.close()
+        source_recv.close()
+        self._procs.add(proc)
+        feeder = loop.run_in_executor(None, _feed, source_send, source)
+
+        result = loop.create_future()
+        fd = recv_conn.fileno()
+
+        def on_readable():
+            loop.remove_reader(fd)
+            if result.done():
+                return
+            try:
+                result.set_result(recv_conn.recv())
+            except EOFError:
+                # The child exited (or was killed) without sending anything.
+                result.set_result(None)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            message = await asyncio.wait_for(result, self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ExtractionUnavailable(
+                f"Document extraction timed out after {self.timeout_seconds:g}s"
+            )
+        finally:
+            loop.remove_reader(fd)
+            if proc.is_alive():
+                proc.kill()
+            recv_conn.close()
+            # Reap the child off the loop (join blocks), and don't return
+            # while the feeder may still read the caller's file.
+            reaper = loop.run_in_executor(None, proc.join, 1)
+            await asyncio.wait([feeder, reaper])
+            self._procs.discard(proc)
+
+        if message is None:
+            raise ExtractionUnavailable("Document extraction worker crashed")
+        status, payload = message
+        if status == "error":
+            raise ExtractionError(payload)
+        return payload
+
+    def stats(self) -> Dict:
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "running": self.running,
+            "queued": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "latency_ms_p50": pct(0.5),
+            "latency_ms_p99": pct(0.99),
+        }
+
+    def shutdown(self) -> None:
+        for proc in list(self._procs):
+            if proc.is_alive():
+                proc.kill()
+        self._procs.clear()
+
+
+extraction_service = ExtractionService(
+    settings.extraction_workers,
+    settings.extraction_queue_size,
+    settings.extraction_timeout_seconds,
+)
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Type
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import parse_node_map, settings
+from app.services.llm_registry import LLMHandle
+from app.services.single_flight import single_flight
+
+
+def _plain(value: Any) -> Any:
+    # Prompt or message list -> JSON-serialisable form for the cache key.
+    from langchain_core.messages import BaseMessage
+
+    if isinstance(value, BaseMessage):
+        return {"type": value.type, "content": value.content}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class LLMResponseCache:
+    # Exact-match cache of model responses: a per-worker LRU in front of an
+    # optional Redis tier shared across workers. Cache errors only cost the
+    # cache, never the call.
+    def __init__(self, max_entries: int, redis_client=None, prefix: str = "hirelens:llm:"):
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.prefix = prefix
+        self._data: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, Dict[str, int]] = {}
+        self.errors = 0
+
+    def _get_local(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def _set_local(self, key: str, value: Dict, ttl: int) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    async def get(self, key: str, ttl: int) -> Optional[Dict]:
+        value = self._get_local(key)
+        if value is not None or self.redis is None:
+            return value
+        try:
+            raw = await asyncio.to_thread(self.redis.get, self.prefix + key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        self._set_local(key, value, ttl)
+        return value
+
+    async def set(self, key: str, value: Dict, ttl: int) -> None:
+        self._set_local(key, value, ttl)
+        if self.redis is None:
+            return
+        try:
+            await asyncio.to_thread(self.redis.set, self.prefix + key, json.dumps(value), ex=ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def record(self, node: str, outcome: str) -> None:
+        counts = self._nodes.setdefault(node, {"hits": 0, "misses": 0, "bypassed": 0})
+        counts[outcome] += 1
+
+    def stats(self) -> Dict:
+        nodes = {}
+        for node, counts in self._nodes.items():
+            looked_up = counts["hits"] + counts["misses"]
+            nodes[node] = {**counts, "hit_rate": round(counts["hits"] / looked_up, 4) if looked_up else 0.0}
+        return {
+            "backend": "redis" if self.redis is not None else "memory",
+            "entries": len(self._data),
+            "errors": self.errors,
+            "nodes": nodes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        self._nodes.clear()
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> LLMResponseCache:
+    redis_client = None
+    if settings.llm_cache_backend == "redis":
+        import redis
+        redis_client = redis.Redis.from_url(settings.redis_url, socket_timeout=0.25, socket_connect_timeout=0.25)
+    return LLMResponseCache(settings.llm_cache_max_entries, redis_client)
+
+
+class CachedModel:
+    # Stands in for a chat model (or its structured-output runnable) in an
+    # agent node. Responses are cached under the model, its sampling
+    # parameters, the output schema and the exact prompt, for the node's TTL
+    # from LLM_CACHE_TTLS. Nodes without a TTL (creative ones: chat, cover
+    # letters, rewrites) always call the model, and so does any model that
+    # samples: a cached answer would pin one draw of it for the whole TTL.
+    def __init__(self, llm, node: str, schema: Optional[Type[BaseModel]] = None):
+        self.node = node
+        self.schema = schema
+        self.runnable = llm.with_structured_output(schema) if schema is not None else llm
+        # A JSON-mode handle answers in text, but its schema still shapes it.
+        key_schema = schema
+        if key_schema is None and isinstance(llm, LLMHandle):
+            key_schema = llm.profile.schema
+        schema_id = None
+        if key_schema is not None:
+            schema_json = json.dumps(key_schema.model_json_schema(), sort_keys=True)
+            schema_id = f"{key_schema.__name__}:{hashlib.sha256(schema_json.encode()).hexdigest()[:16]}"
+        self._key_base = {
+            "model": getattr(llm, "model", type(llm).__name__),
+            "temperature": getattr(llm, "temperature", None),
+            "seed": getattr(llm, "seed", None),
+            "schema": schema_id,
+        }
+        self.deterministic = self._key_base["temperature"] == 0 or self._key_base["seed"] is not None
+
+    def ttl(self) -> int:
+        # Only a temperature 0 or fixed-seed profile, whatever the TTL map says.
+        if not self.deterministic:
+            return 0
+        return parse_node_map(settings.llm_cache_ttls).get(self.node, 0)
+
+    def cache_key(self, prompt: Any) -> str:
+        payload = json.dumps({**self._key_base, "input": _plain(prompt)}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8", "surrogatepass")).hexdigest()
+
+    async def ainvoke(self, prompt: Any, **kwargs):
+        cache = get_llm_cache()
+        ttl = self.ttl()
+        if ttl <= 0:
+            cache.record(self.node, "bypassed")
+            return await self._call(self.cache_key(prompt), lambda: self.runnable.ainvoke(prompt, **kwargs), kwargs)
+
+        key = self.cache_key(prompt)
+        cached = await cache.get(key, ttl)
+        if cached is not None:
+            cache.record(self.node, "hits")
+            if self.schema is not None:
+                return self.schema.model_validate(cached)
+            from langchain_core.messages import AIMessage
+
+            return AIMessage(content=cached["content"])
+
+        cache.record(self.node, "misses")
+
+        async def call():
+            result = await self.runnable.ainvoke(prompt, **kwargs)
+            if self.schema is not None:
+                # A structured call can come back empty; never cache that.
+                if isinstance(result, BaseModel):
+                    await cache.set(key, result.model_dump(mode="json"), ttl)
+            else:
+                await cache.set(key, {"content": result.content}, ttl)
+            return result
+
+        return await self._call(key, call, kwargs)
+
+    async def _call(self, key: str, fn, kwargs: Dict):
+        # Identical requests already in flight (a double-click, two tabs, a
+        # full report next to a lone analyze) wait for that call. Calls with
+        # extra kwargs aren't in the key, so they always go out on their own.
+        if kwargs or not settings.llm_single_flight:
+            return await fn()
+        return await single_flight.do(key, fn, self.node)
+
+    async def astream(self, prompt: Any, **kwargs) -> AsyncIterator:
+        # Plain models only. A hit comes back as one chunk; a miss streams
+        # through and is cached once the stream has finished.
+        cache = get_llm_cache()
+        ttl = self.ttl()
+        if ttl <= 0:
+            cache.record(self.node, "bypassed")
+            async for chunk in self.runnable.astream(prompt, **kwargs):
+                yield chunk
+            return
+
+        from langchain_core.messages import AIMessageChunk
+
+        key = self.cache_key(prompt)
+        cached = await cache.get(key, ttl)
+        if cached is not None:
+            cache.record(self.node, "hits")
+            yield AIMessageChunk(content=cached["content"])
+            return
+
+        cache.record(self.node, "misses")
+        parts = []
+        async for chunk in self.runnable.astream(prompt, **kwargs):
+            parts.append(chunk.content)
+            yield chunk
+        await cache.set(key, {"content": "".join(parts)}, ttl)
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, NamedTuple, Optional, Type
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+
+class LLMProfile(NamedTuple):
+    model: str
+    temperature: float
+    seed: Optional[int] = None
+    schema: Optional[Type[BaseModel]] = None
+    # The schema constrains the response, but it comes back as JSON text
+    # for the caller to parse (and stream) instead of a parsed object.
+    raw_json: bool = False
+
+    @property
+    def name(self) -> str:
+        # "gemini-2.5-flash@0.3", "gemini-2.5-flash@0+seed42:QualitativeAnalysis",
+        # "gemini-2.5-flash@0.4:CoverLetterOutput/json"
+        name = f"{self.model}@{self.temperature:g}"
+        if self.seed is not None:
+            name += f"+seed{self.seed}"
+        if self.schema is not None:
+            name += f":{self.schema.__name__}"
+            if self.raw_json:
+                name += "/json"
+        return name
+
+
+class _ProfileStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latencies: Deque[float] = deque(maxlen=1000)
+
+    def snapshot(self) -> Dict:
+        latencies = sorted(self.latencies)
+
+        def pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_ms_p50": pct(0.5),
+            "latency_ms_p99": pct(0.99),
+        }
+
+
+class LLMRegistry:
+    # One chat client per profile, built on first use. Every profile is a
+    # copy of a single base model, so they all share its google-genai Client
+    # and with it one pooled HTTP connection set, instead of a client and
+    # transport per agent module.
+    def __init__(self):
+        self._base = None
+        self._clients: Dict[LLMProfile, Any] = {}
+        self._stats: Dict[str, _ProfileStats] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, profile: LLMProfile):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        if self._base is None:
+            self._base = ChatGoogleGenerativeAI(
+                model=DEFAULT_MODEL,
+                google_api_key=settings.google_api_key,
+            )
+        # model_copy skips validation, which is where a new Client would be made.
+        llm = self._base.model_copy(
+            update={"model": profile.model, "temperature": profile.temperature, "seed": profile.seed}
+        )
+        if profile.schema is None:
+            return llm
+        if profile.raw_json:
+            # What with_structured_output binds, minus its parser.
+            return llm.bind(
+                response_mime_type="application/json",
+                response_json_schema=profile.schema.model_json_schema(),
+            )
+        return llm.with_structured_output(profile.schema)
+
+    def client(self, profile: LLMProfile):
+        client = self._clients.get(profile)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(profile)
+                if client is None:
+                    client = self._clients[profile] = self._build(profile)
+        return client
+
+    def profile_stats(self, profile: LLMProfile) -> _ProfileStats:
+        stats = self._stats.get(profile.name)
+        if stats is None:
+            stats = self._stats.setdefault(profile.name, _ProfileStats())
+        return stats
+
+    def stats(self) -> Dict:
+        return {
+            "clients_built": len(self._clients),
+            "profiles": {name: stats.snapshot() for name, stats in self._stats.items()},
+        }
+
+
+llm_registry = LLMRegistry()
+
+
+class LLMHandle:
+    # What agent modules hold from import time on: a profile, resolved to the
+    # registry's shared client on the first call. Times every call.
+    def __init__(self, profile: LLMProfile, registry: LLMRegistry = llm_registry):
+        self.profile = profile
+        self.registry = registry
+
+    @property
+    def model(self) -> str:
+        return self.profile.model
+
+    @property
+    def temperature(self) -> float:
+        return self.profile.temperature
+
+    @property
+    def seed(self) -> Optional[int]:
+        return self.profile.seed
+
+    def with_structured_output(self, schema: Type[BaseModel]) -> "LLMHandle":
+        return LLMHandle(self.profile._replace(schema=schema), self.registry)
+
+    def json_output(self, schema: Type[BaseModel]) -> "LLMHandle":
+        return LLMHandle(self.profile._replace(schema=schema, raw_json=True), self.registry)
+
+    async def ainvoke(self, prompt: Any, **kwargs):
+        stats = self.registry.profile_stats(self.profile)
+        stats.calls += 1
+        started = time.perf_counter()
+        try:
+            return await self.registry.client(self.profile).ainvoke(prompt, **kwargs)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.latencies.append(time.perf_counter() - started)
+
+    async def astream(self, prompt: Any, **kwargs) -> AsyncIterator:
+        stats = self.registry.profile_stats(self.profile)
+        stats.calls += 1
+        started = time.perf_counter()
+        try:
+            async for chunk in self.registry.client(self.profile).astream(prompt, **kwargs):
+                yield chunk
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.latencies.append(time.perf_counter() - started)
+
+
+def get_llm(
+    temperature: float,
+    schema: Optional[Type[BaseModel]] = None,
+    model: str = DEFAULT_MODEL,
+    seed: Optional[int] = None,
+) -> LLMHandle:
+    return LLMHandle(LLMProfile(model, temperature, seed, schema))
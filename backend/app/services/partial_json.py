@@ -0,0 +1,175 @@
+import json
+from bisect import bisect_right
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+PathPart = Union[str, int]
+Path = Tuple[PathPart, ...]
+
+_WHITESPACE = " \t\r\n"
+_SCALAR_END = ",}]" + _WHITESPACE
+
+
+class _Frame:
+    __slots__ = ("kind", "key", "index", "state", "watch", "start")
+
+    def __init__(self, kind: str, watch: Optional[Path], start: int):
+        self.kind = kind  # "obj" or "arr"
+        self.key: Optional[str] = None
+        self.index = 0
+        # obj: key -> colon -> value -> comma; arr: value -> comma
+        self.state = "key" if kind == "obj" else "value"
+        self.watch = watch
+        self.start = start
+
+
+class IncrementalJSONParser:
+    # Reads a JSON document as a model streams it and hands back each value
+    # at a watched path as soon as its last character arrives, so a caller
+    # can forward "primary_letter" long before the closing brace. Paths are
+    # tuples of keys and list indexes, "*" matching any index:
+    # ("tone_variants", "*") reports each variant as it completes. Text before
+    # the first "{" or "[" (a ```json fence) and after the document is ignored.
+    def __init__(self, paths: Iterable[Path]):
+        self.paths = [tuple(p) for p in paths]
+        self.done = False
+        # Chunks as fed and where each starts in the document; positions
+        # below are offsets into the whole document.
+        self._chunks: List[str] = []
+        self._offsets: List[int] = []
+        self._length = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._value_start = -1
+        self._value_watch: Optional[Path] = None
+        self._in_scalar = False
+
+    @property
+    def text(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._offsets = [0]
+        return self._chunks[0] if self._chunks else ""
+
+    def _slice(self, start: int, end: int) -> str:
+        first = bisect_right(self._offsets, start) - 1
+        last = bisect_right(self._offsets, end - 1)
+        base = self._offsets[first]
+        return "".join(self._chunks[first:last])[start - base:end - base]
+
+    def _path(self) -> Path:
+        return tuple(f.key if f.kind == "obj" else f.index for f in self._stack)
+
+    def _watched(self, path: Path) -> bool:
+        return any(
+            len(p) == len(path) and all(w == "*" or w == part for w, part in zip(p, path))
+            for p in self.paths
+        )
+
+    def feed(self, chunk: str) -> List[Tuple[Path, Any]]:
+        # Only the new chunk is scanned; the text before it is joined again
+        # only for a value that spans chunks, once, when it completes.
+        base = self._length
+        self._chunks.append(chunk)
+        self._offsets.append(base)
+        self._length += len(chunk)
+        completed: List[Tuple[Path, Any]] = []
+        i = 0
+        n = len(chunk)
+        while i < n and not self.done:
+            c = chunk[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    frame = self._stack[-1]
+                    if self._string_is_key:
+                        raw = self._slice(self._value_start, base + i + 1)
+                        try:
+                            frame.key = json.loads(raw)
+                        except ValueError:
+                            # A bad escape: match paths on the key as written.
+                            frame.key = raw[1:-1]
+                        frame.state = "colon"
+                    else:
+                        self._finish(completed, self._value_watch, self._value_start, base + i + 1)
+                i += 1
+                continue
+            if self._in_scalar:
+                if c not in _SCALAR_END:
+                    i += 1
+                    continue
+                self._in_scalar = False
+                self._finish(completed, self._value_watch, self._value_start, base + i)
+            if not self._stack:
+                if c in "{[":
+                    self._open(c, () if self._watched(()) else None, base + i)
+                i += 1
+                continue
+            if c in _WHITESPACE:
+                i += 1
+                continue
+
+            frame = self._stack[-1]
+            if frame.state == "key":
+                if c == '"':
+                    self._in_string = True
+                    self._string_is_key = True
+                    self._value_start = base + i
+                elif c == "}":
+                    self._close(completed, base + i)
+            elif frame.state == "colon":
+                if c == ":":
+                    frame.state = "value"
+            elif frame.state == "comma":
+                if c == ",":
+                    if frame.kind == "obj":
+                        frame.state = "key"
+                    else:
+                        frame.state = "value"
+                        frame.index += 1
+                elif c in "}]":
+                    self._close(completed, base + i)
+            elif c == "]" and frame.kind == "arr":
+                # Empty array.
+                self._close(completed, base + i)
+            else:
+                path = self._path()
+                watch = path if self._watched(path) else None
+                if c in "{[":
+                    self._open(c, watch, base + i)
+                else:
+                    self._value_start = base + i
+                    self._value_watch = watch
+                    if c == '"':
+                        self._in_string = True
+                        self._string_is_key = False
+                    else:
+                        self._in_scalar = True
+            i += 1
+        return completed
+
+    def _open(self, c: str, watch: Optional[Path], start: int) -> None:
+        self._stack.append(_Frame("obj" if c == "{" else "arr", watch, start))
+
+    def _close(self, completed: List[Tuple[Path, Any]], i: int) -> None:
+        frame = self._stack.pop()
+        self._finish(completed, frame.watch, frame.start, i + 1)
+
+    def _finish(self, completed: List[Tuple[Path, Any]], watch: Optional[Path], start: int, end: int) -> None:
+        if watch is not None:
+            try:
+                completed.append((watch, json.loads(self._slice(start, end))))
+            except ValueError:
+                # Not valid JSON (a bare word, a bad escape): no early event
+                # for it. The caller's final parse of the whole text, with
+                # repairs, decides what the value is.
+                pass
+        if self._stack:
+            self._stack[-1].state = "comma"
+        else:
+            self.done = True
@@ -0,0 +1,80 @@
+from typing import List, NamedTuple, Tuple
+
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter
+
+# Fast PDF text: the page's glyphs in content-stream order, grouped into
+# lines by baseline. Kept out of resume_parser so pdfminer only loads once a
+# PDF is actually read.
+
+
+class ContentOrderText(PDFTextDevice):
+    # Records each character's baseline position and advance as the content
+    # stream draws it. No layout objects are built, which is where
+    # pdfplumber spends most of its time on a text-heavy page.
+    def __init__(self, rsrcmgr):
+        super().__init__(rsrcmgr)
+        # (x, y, x_end, size, text) in device space
+        self.chars: List[Tuple[float, float, float, float, str]] = []
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate) -> float:
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = f"(cid:{cid})"
+        advance = font.char_width(cid) * fontsize * scaling
+        a, b, c, d, e, f = matrix
+        self.chars.append((e, f, e + a * advance, fontsize * (abs(d) or abs(c) or 1), text))
+        return advance
+
+
+class Line(NamedTuple):
+    x: float
+    y: float
+    size: float
+    text: str
+
+
+def fast_page_lines(page) -> List[Line]:
+    device = ContentOrderText(page.pdf.rsrcmgr)
+    PDFPageInterpreter(page.pdf.rsrcmgr, device).process_page(page.page_obj)
+
+    lines: List[Line] = []
+    parts: List[str] = []
+    first = prev = None
+
+    def flush() -> None:
+        text = " ".join("".join(parts).split())
+        if text:
+            lines.append(Line(first[0], first[1], first[3], text))
+
+    for char in device.chars:
+        x, y, _, size, text = char
+        if prev is None:
+            first = char
+        elif abs(y - prev[1]) > prev[3] * 0.5:
+            flush()
+            parts = []
+            first = char
+        elif x - prev[2] > prev[3] * 0.15:
+            # Separately positioned words on the same baseline.
+            parts.append(" ")
+        parts.append(text)
+        prev = char
+    if prev is not None:
+        flush()
+    return lines
+
+
+def looks_garbled(lines: List[Line]) -> bool:
+    # Content order only matches reading order when the page was drawn top
+    # to bottom. Columns drawn piecewise make the baseline jump back up the
+    # page over and over, and text placed glyph by glyph or wrapped in
+    # narrow boxes comes out as a run of very short lines. One or two jumps
+    # (a second column, a header drawn last) read fine as they are.
+    if len(lines) < 4:
+        return False
+    jumps = sum(1 for prev, line in zip(lines, lines[1:]) if line.y - prev.y > prev.size)
+    short = sum(1 for line in lines if len(line.text) <= 2)
+    return jumps > max(2, len(lines) * 0.1) or short > len(lines) * 0.3
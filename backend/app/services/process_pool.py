@@ -0,0 +1,46 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+
+_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def pool_size() -> int:
+    return settings.process_pool_workers or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            # Not fork: workers start lazily inside a threaded server, and a
+            # fork taken while another thread holds a lock (the line feature
+            # cache's, say) leaves the child deadlocked on it.
+            _pool = ProcessPoolExecutor(max_workers=pool_size(), mp_context=multiprocessing.get_context("forkserver"))
+        return _pool
+
+
+def reset_process_pool(broken: Optional[ProcessPoolExecutor] = None) -> None:
+    # Called after a worker died (BrokenProcessPool); the next caller gets a
+    # fresh pool instead of failing every remaining job. Passing the pool that
+    # broke makes late reports about an already replaced pool a no-op.
+    global _pool
+    with _lock:
+        if broken is not None and broken is not _pool:
+            return
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
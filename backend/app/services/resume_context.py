@@ -0,0 +1,165 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+from loguru import logger
+
+from app.core.config import parse_node_map, settings
+from app.services.sections import build_section_index
+
+# "3", "Page 2", "page 2 of 3", "2/3", "- 4 -"
+_PAGE_NUMBER_RE = re.compile(
+    r"^(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$|^[-–—]\s*\d{1,3}\s*[-–—]$",
+    re.IGNORECASE,
+)
+_SPACE_RUN_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+# Running headers: a short line from the top of the text that shows up again
+# right after a page break (a blank line, page number or form feed) is the
+# page header repeated, and only its first copy is kept.
+_RUNNING_LINE_MAX_LEN = 100
+_RUNNING_LINE_EDGE = 3
+
+# When a prompt is over its budget, body lines are dropped from the least
+# useful sections first (from each section's end). Headings and the header
+# block (name, contact) are always kept.
+_TRIM_ORDER = [
+    "interests", "volunteer", "publications", "awards", "languages",
+    "certifications", "projects", "education", "summary", "skills", "experience",
+]
+
+
+def estimate_tokens(text: str) -> int:
+    # Gemini averages about four characters of English per token; close
+    # enough for budgeting and far cheaper than a tokenizer round-trip.
+    return (len(text) + 3) // 4
+
+
+def denoise_lines(text: str) -> List[str]:
+    entries: List[Tuple[str, bool]] = []
+    after_break = False
+    for raw in text.splitlines():
+        line = _SPACE_RUN_RE.sub(" ", raw).strip()
+        if not line or _PAGE_NUMBER_RE.match(line):
+            after_break = True
+            continue
+        entries.append((line, after_break))
+        after_break = False
+    top = {line for line, _ in entries[:_RUNNING_LINE_EDGE] if len(line) <= _RUNNING_LINE_MAX_LEN}
+    seen = set()
+    out = []
+    for line, after_break in entries:
+        if after_break and line in top and line in seen:
+            continue
+        seen.add(line)
+        out.append(line)
+    return out
+
+
+@lru_cache(maxsize=64)
+def _canonical_blocks(text: str) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    # (section, lines) blocks, heading line first; "header" is whatever
+    # precedes the first heading. Cached: a full report asks for the same
+    # resume from five nodes at once.
+    lines = denoise_lines(text)
+    spans = build_section_index("\n".join(lines))
+    blocks = []
+    first = spans[0].start if spans else len(lines)
+    if first:
+        blocks.append(("header", tuple(lines[:first])))
+    for span in spans:
+        blocks.append((span.section, tuple(lines[span.start:span.end])))
+    return tuple(blocks)
+
+
+def _render(blocks: List[Tuple[str, List[str]]]) -> str:
+    return "\n\n".join("\n".join(lines) for _, lines in blocks if lines)
+
+
+def _trim(blocks: List[Tuple[str, List[str]]], budget: int) -> List[Tuple[str, List[str]]]:
+    blocks = [(section, list(lines)) for section, lines in blocks]
+    # In characters, the unit estimate_tokens counts in.
+    excess = len(_render(blocks)) - budget * 4
+    order = sorted(
+        (i for i, (section, _) in enumerate(blocks) if section != "header"),
+        key=lambda i: _TRIM_ORDER.index(blocks[i][0]) if blocks[i][0] in _TRIM_ORDER else -1,
+    )
+    for i in order:
+        lines = blocks[i][1]
+        while excess > 0 and len(lines) > 1:
+            excess -= len(lines.pop()) + 1
+        if excess <= 0:
+            break
+    return blocks
+
+
+class ResumeContext(NamedTuple):
+    text: str
+    tokens: int
+    original_tokens: int
+    trimmed: bool
+
+    @property
+    def saved(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+class _NodeStats:
+    def __init__(self):
+        self.calls = 0
+        self.trimmed = 0
+        self.original_tokens = 0
+        self.tokens = 0
+
+
+class ContextStats:
+    def __init__(self):
+        self._nodes: Dict[str, _NodeStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, node: str, context: ResumeContext) -> None:
+        with self._lock:
+            stats = self._nodes.setdefault(node, _NodeStats())
+            stats.calls += 1
+            stats.trimmed += context.trimmed
+            stats.original_tokens += context.original_tokens
+            stats.tokens += context.tokens
+
+    def stats(self) -> Dict:
+        nodes = {}
+        for node, s in self._nodes.items():
+            saved = s.original_tokens - s.tokens
+            nodes[node] = {
+                "calls": s.calls,
+                "trimmed": s.trimmed,
+                "tokens_sent": s.tokens,
+                "tokens_saved": saved,
+                "saved_ratio": round(saved / s.original_tokens, 4) if s.original_tokens else 0.0,
+            }
+        return {"nodes": nodes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+
+context_stats = ContextStats()
+
+
+def resume_context(resume_text: str, node: str, trim: bool = True) -> ResumeContext:
+    # The resume as agent prompts see it: whitespace runs, page numbers and
+    # repeated running headers removed, one blank line between sections, and
+    # cut to the node's RESUME_CONTEXT_BUDGETS entry (0 or unlisted: no cut).
+    # trim=False is for nodes that must see every line, whatever the config.
+    # Deterministic scoring keeps using the raw text.
+    blocks = _canonical_blocks(resume_text)
+    text = _render(blocks)
+    budget = parse_node_map(settings.resume_context_budgets).get(node, 0) if trim else 0
+    trimmed = False
+    if budget and estimate_tokens(text) > budget:
+        text = _render(_trim(blocks, budget))
+        trimmed = True
+    context = ResumeContext(text, estimate_tokens(text), estimate_tokens(resume_text), trimmed)
+    context_stats.record(node, context)
+    logger.debug(f"Resume context for {node}: {context.tokens} tokens, {context.saved} saved")
+    return context
@@ -1,59 +1,362 @@
-import pdfplumber
-from docx import Document
+import io
+import posixpath
+import time
+import zipfile
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from xml.etree.ElementTree import fromstring, iterparse
 import re
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, Union
+from app.core.config import settings
 from app.schemas.resume import ResumeSections
+from app.services.process_pool import get_process_pool, pool_size, reset_process_pool
+from app.services.sections import build_section_index, inline_content
 
+# A file path, raw bytes or an open binary file (e.g. an upload's
+# SpooledTemporaryFile). Uploads are parsed straight from memory; nothing is
+# copied to a temp file first.
+DocumentSource = Union[str, bytes, BinaryIO]
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-    return text
 
+def _open_pdf(source: DocumentSource):
+    # pdfplumber/pdfminer load on the first PDF, not when the app imports
+    # this module for parse_resume_text.
+    import pdfplumber
+    return pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source)
 
-def extract_text_from_docx(file_path: str) -> str:
-    doc = Document(file_path)
-    return "\n".join([p.text for p in doc.paragraphs])
+
+def _page_text(page, mode: str) -> Tuple[str, str]:
+    # "fast" reads text in content order, "layout" is pdfplumber's
+    # positional reconstruction, and "auto" starts fast and falls back to
+    # layout for a page whose fast text looks out of order.
+    if mode != "layout":
+        from app.services.pdf_fast_text import fast_page_lines, looks_garbled
+        try:
+            lines = fast_page_lines(page)
+        except Exception:
+            lines = None
+        if lines is not None and (mode == "fast" or not looks_garbled(lines)):
+            return "\n".join(line.text for line in lines), "fast"
+    return page.extract_text() or "", "layout"
+
+
+def _page_texts(pdf, start: int, stop: int, mode: str) -> Iterator[Tuple[str, str]]:
+    for page in pdf.pages[start:stop]:
+        yield _page_text(page, mode)
+        # Drop the page's parsed layout objects; long PDFs otherwise keep
+        # every page in memory until the file is closed.
+        page.close()
+
+
+def _extract_page_range(source: DocumentSource, start: int, stop: int, mode: str) -> List[Tuple[str, str]]:
+    with _open_pdf(source) as pdf:
+        return list(_page_texts(pdf, start, stop, mode))
+
+
+def _page_texts_parallel(source: DocumentSource, page_count: int, mode: str) -> Iterator[Tuple[str, str]]:
+    # Page ranges go to the shared process pool; results come back in page
+    # order, with a bounded number of ranges queued ahead of the consumer.
+    step = settings.pdf_pages_per_task
+    ranges = iter(range(0, page_count, step))
+    pending = deque()
+
+    def submit_next() -> None:
+        start = next(ranges, None)
+        if start is None:
+            return
+        pool = get_process_pool()
+        try:
+            future = pool.submit(_extract_page_range, source, start, min(start + step, page_count), mode)
+        except BrokenProcessPool:
+            reset_process_pool(pool)
+            pool = get_process_pool()
+            future = pool.submit(_extract_page_range, source, start, min(start + step, page_count), mode)
+        pending.append((future, pool))
+
+    try:
+        for _ in range(pool_size() * 2):
+            submit_next()
+        while pending:
+            future, pool = pending.popleft()
+            try:
+                texts = future.result()
+            except BrokenProcessPool:
+                reset_process_pool(pool)
+                raise
+            submit_next()
+            yield from texts
+    finally:
+        for future, _ in pending:
+            future.cancel()
+
+
+def _iter_pdf_pages(
+    source: DocumentSource,
+    max_pages: Optional[int],
+    max_chars: Optional[int],
+    parallel: bool,
+    mode: Optional[str],
+) -> Iterator[Tuple[str, str]]:
+    max_pages = settings.pdf_max_pages if max_pages is None else max_pages
+    max_chars = settings.pdf_max_chars if max_chars is None else max_chars
+    mode = settings.pdf_text_mode if mode is None else mode
+    remaining = max_chars
+    with _open_pdf(source) as pdf:
+        page_count = min(len(pdf.pages), max_pages)
+        if parallel and page_count >= settings.pdf_parallel_min_pages and pool_size() > 1:
+            # Pool workers need a picklable source; an open file is sent as bytes.
+            if not isinstance(source, (str, bytes)):
+                source.seek(0)
+                source = source.read()
+            pages = _page_texts_parallel(source, page_count, mode)
+        else:
+            pages = _page_texts(pdf, 0, page_count, mode)
+        try:
+            for text, page_mode in pages:
+                if len(text) >= remaining:
+                    yield text[:remaining], page_mode
+                    return
+                remaining -= len(text)
+                yield text, page_mode
+        finally:
+            pages.close()
+
+
+def iter_pdf_pages(
+    source: DocumentSource,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    parallel: bool = True,
+    mode: Optional[str] = None,
+) -> Iterator[str]:
+    # Yields page text as each page is extracted, so callers can start on the
+    # first pages early. Stops at max_pages pages or max_chars characters
+    # (the last page is truncated), so an accidental 300-page upload costs no
+    # more than a normal resume.
+    for text, _ in _iter_pdf_pages(source, max_pages, max_chars, parallel, mode):
+        yield text
+
+
+class ExtractedText(NamedTuple):
+    text: str
+    # "fast" or "layout" for a PDF ("layout" once any page needed it), or "docx"
+    mode: str
+    pages: int
+    layout_pages: int
+    seconds: float
+
+
+def extract_pdf(source: DocumentSource, parallel: bool = True, mode: Optional[str] = None) -> ExtractedText:
+    started = time.perf_counter()
+    texts, modes = [], []
+    for text, page_mode in _iter_pdf_pages(source, None, None, parallel, mode):
+        texts.append(text)
+        modes.append(page_mode)
+    layout_pages = modes.count("layout")
+    return ExtractedText(
+        "".join(texts),
+        "layout" if layout_pages else "fast",
+        len(modes),
+        layout_pages,
+        time.perf_counter() - started,
+    )
+
+
+def extract_text_from_pdf(source: DocumentSource, parallel: bool = True, mode: Optional[str] = None) -> str:
+    return extract_pdf(source, parallel, mode).text
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_DOCX_CONTAINERS = {_W + "body", _W + "hdr", _W + "ftr"}
+_DOCX_RUN_TEXT = {_W + "t": None, _W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n"}
+_RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CONTENT_TYPES = "{http://schemas.openxmlformats.org/package/2006/content-types}"
+# Relationship types end the same in the transitional and strict schemas.
+_REL_OFFICE_DOCUMENT = "/officeDocument"
+_REL_HEADER = "/header"
+_REL_FOOTER = "/footer"
+_DOCX_MAIN_TYPES = {
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml",
+    "application/vnd.ms-word.document.macroEnabled.main+xml",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.template.main+xml",
+}
+
+
+def _iter_docx_part(stream) -> Iterator[str]:
+    # One pass of incremental XML parsing over a WordprocessingML part. Yields
+    # each paragraph's text, and each table row as its cells joined by tabs
+    # (the ATS table_like feature counts rows of 3+ cells, as ATS parsers
+    # struggle with them).
+    # Finished top-level blocks are dropped from the tree, so memory stays
+    # flat however long the part is.
+    paragraphs: List[List[str]] = []  # open paragraphs, innermost last
+    rows: List[List[str]] = []
+    cells: List[List[str]] = []
+    container = None
+    container_depth = depth = in_run = in_fallback = 0
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            depth += 1
+            if tag == _W + "p":
+                paragraphs.append([])
+            elif tag == _W + "r":
+                in_run += 1
+            elif tag == _W + "tr":
+                rows.append([])
+            elif tag == _W + "tc":
+                cells.append([])
+            elif tag == _MC_FALLBACK:
+                # Legacy copy of the preceding mc:Choice (e.g. a text box).
+                in_fallback += 1
+            elif tag in _DOCX_CONTAINERS:
+                container, container_depth = elem, depth
+            continue
+
+        depth -= 1
+        if tag in _DOCX_RUN_TEXT:
+            if in_run and paragraphs and not in_fallback:
+                text = _DOCX_RUN_TEXT[tag]
+                paragraphs[-1].append((elem.text or "") if text is None else text)
+        elif tag == _W + "r":
+            in_run -= 1
+        elif tag == _W + "p" and paragraphs:
+            text = "".join(paragraphs.pop())
+            if in_fallback:
+                pass
+            elif cells:
+                cells[-1].append(text)
+            else:
+                yield text
+        elif tag == _W + "tc" and cells:
+            cell = " ".join(t.strip() for t in cells.pop() if t.strip())
+            if rows:
+                rows[-1].append(cell)
+        elif tag == _W + "tr" and rows:
+            line = "\t".join(rows.pop())
+            if cells:
+                cells[-1].append(line)
+            elif line.strip():
+                yield line
+        elif tag == _MC_FALLBACK:
+            in_fallback -= 1
+
+        if container is not None and depth == container_depth:
+            container.clear()
+
+
+def _docx_relationships(zf: zipfile.ZipFile, part: str) -> List[Tuple[str, str]]:
+    # (type, part name) for every internal relationship of a package part
+    # ("" for the package itself), targets resolved to zip member names.
+    base, name = posixpath.split(part)
+    rels = posixpath.join(base, "_rels", name + ".rels")
+    try:
+        root = fromstring(zf.read(rels))
+    except KeyError:
+        return []
+    out = []
+    for rel in root.iter(_RELS + "Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        target = target[1:] if target.startswith("/") else posixpath.join(base, target)
+        out.append((rel.get("Type", ""), posixpath.normpath(target)))
+    return out
+
+
+def _docx_main_part(zf: zipfile.ZipFile) -> str:
+    for rel_type, target in _docx_relationships(zf, ""):
+        if rel_type.endswith(_REL_OFFICE_DOCUMENT):
+            return target
+    # No package relationships: fall back to the content type overrides.
+    try:
+        types = fromstring(zf.read("[Content_Types].xml"))
+    except KeyError:
+        types = None
+    if types is not None:
+        for override in types.iter(_CONTENT_TYPES + "Override"):
+            if override.get("ContentType") in _DOCX_MAIN_TYPES:
+                return override.get("PartName", "").lstrip("/")
+    return "word/document.xml"
+
+
+def iter_docx_lines(source: DocumentSource) -> Iterator[str]:
+    # Reads only the XML parts that hold text; embedded images and fonts are
+    # never decompressed. Parts are found through the package relationships,
+    # not by file name, so producers that name them differently still work.
+    # Headers come first (they usually carry the name and contact line), then
+    # the body, then footers; repeated header/footer lines (first-page/
+    # even-page variants) are emitted once.
+    with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as zf:
+        names = set(zf.namelist())
+        main = _docx_main_part(zf)
+        if main not in names:
+            raise ValueError("Not a Word document: no main document part")
+        related = _docx_relationships(zf, main)
+        headers = sorted({t for r, t in related if r.endswith(_REL_HEADER) and t in names})
+        footers = sorted({t for r, t in related if r.endswith(_REL_FOOTER) and t in names})
+        seen = set()
+        for part in headers + [main] + footers:
+            with zf.open(part) as stream:
+                for line in _iter_docx_part(stream):
+                    if part != main:
+                        if not line.strip() or line in seen:
+                            continue
+                        seen.add(line)
+                    yield line
+
+
+def extract_text_from_docx(source: DocumentSource) -> str:
+    out = []
+    remaining = settings.docx_max_chars
+    for line in iter_docx_lines(source):
+        if len(line) >= remaining:
+            out.append(line[:remaining])
+            break
+        remaining -= len(line) + 1
+        out.append(line)
+    return "\n".join(out)
+
+
+def extract_document(filename: str, source: DocumentSource, parallel: bool = True) -> ExtractedText:
+    if filename.endswith(".pdf"):
+        return extract_pdf(source, parallel)
+    started = time.perf_counter()
+    text = extract_text_from_docx(source)
+    return ExtractedText(text, "docx", 0, 0, time.perf_counter() - started)
 
 
 def parse_resume_text(text: str) -> ResumeSections:
-    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    raw_lines = text.split("\n")
+    lines = [l.strip() for l in raw_lines if l.strip()]
 
     name = lines[0] if lines else None
     email = next((l for l in lines if "@" in l), None)
     phone = next((l for l in lines if re.search(r"\+?\d{10,13}", l)), None)
 
     skills, experience, education, projects = [], [], [], []
-    current_section = None
+    section_index = build_section_index(text)
 
-    for line in lines:
-        lower = line.lower()
-
-        if "skill" in lower:
-            current_section = "skills"
-            continue
-        elif "experience" in lower:
-            current_section = "experience"
-            continue
-        elif "education" in lower:
-            current_section = "education"
-            continue
-        elif "project" in lower:
-            current_section = "projects"
-            continue
+    for span in section_index:
+        body = [l.strip() for l in raw_lines[span.start + 1:span.end] if l.strip()]
+        inline = inline_content(raw_lines[span.start])
+        if inline:
+            body.insert(0, inline)
 
-        if current_section == "skills":
-            skills.extend([s.strip() for s in line.split(",") if len(s) < 30])
+        if span.section == "skills":
+            for line in body:
+                skills.extend([s.strip() for s in line.split(",") if len(s) < 30])
 
-        elif current_section == "education" and len(education) < 3:
-            education.append(line)
+        elif span.section == "education":
+            education.extend(body[:max(0, 3 - len(education))])
 
-        elif current_section == "experience" and len(experience) < 3:
-            experience.append(line)
+        elif span.section == "experience":
+            experience.extend(body[:max(0, 3 - len(experience))])
 
-        elif current_section == "projects" and len(projects) < 5:
-            projects.append(line.split("—")[0].strip())
+        elif span.section == "projects":
+            projects.extend(line.split("—")[0].strip() for line in body[:max(0, 5 - len(projects))])
 
     return ResumeSections(
         name=name,
@@ -62,5 +365,6 @@ def parse_resume_text(text: str) -> ResumeSections:
         skills=list(set(skills))[:10],
         experience=experience,
         education=education,
-        projects=projects
+        projects=projects,
+        section_index=[span._asdict() for span in section_index],
     )
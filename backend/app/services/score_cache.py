@@ -0,0 +1,142 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from app.core.config import settings
+from app.services.ats_scorer import SCORER_VERSION, compute_ats_scores
+
+
+def normalize_text(text: str) -> str:
+    # Only rewrites that cannot change any score: CRLF line endings and
+    # trailing empty lines.
+    return text.replace("\r\n", "\n").rstrip("\n")
+
+
+def text_key(text: str) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8", "surrogatepass")).hexdigest()
+    return f"{SCORER_VERSION}:{digest}"
+
+
+class InMemoryScoreBackend:
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisScoreBackend:
+    # Shared across uvicorn workers; Redis handles TTL expiry and its own
+    # maxmemory eviction.
+    def __init__(self, url: str, ttl_seconds: int, prefix: str = "hirelens:ats:", client=None):
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Dict]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Dict) -> None:
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl_seconds)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+
+class ScoreMemo:
+    def __init__(self, backend, compute: Callable[[str], Dict] = compute_ats_scores):
+        self.backend = backend
+        self.compute = compute
+        # Counters are bumped from to_thread workers.
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get_or_compute(self, text: str, compute: Optional[Callable[[str], Dict]] = None) -> Dict:
+        key = text_key(text)
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            # A cache outage must never fail scoring.
+            with self._lock:
+                self.errors += 1
+            logger.warning(f"Score cache read failed: {e}")
+            cached = None
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return dict(cached)
+
+        with self._lock:
+            self.misses += 1
+        scores = (compute or self.compute)(text)
+        try:
+            self.backend.set(key, dict(scores))
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            logger.warning(f"Score cache write failed: {e}")
+        return scores
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits, misses, errors = self.hits, self.misses, self.errors
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "errors": errors,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_score_memo() -> ScoreMemo:
+    if settings.score_cache_backend == "redis":
+        backend = RedisScoreBackend(settings.redis_url, settings.score_cache_ttl_seconds)
+    else:
+        backend = InMemoryScoreBackend(settings.score_cache_max_entries, settings.score_cache_ttl_seconds)
+    return ScoreMemo(backend)
+
+
+def cached_ats_scores(text: str, compute: Optional[Callable[[str], Dict]] = None) -> Dict:
+    return get_score_memo().get_or_compute(text, compute)
@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.analysis import AnalysisResult
+
+SCORE_COMPONENTS = (
+    "format_score",
+    "keyword_score",
+    "content_score",
+    "completeness_score",
+    "readability_score",
+    "ats_score",
+)
+
+
+class ScorePercentileStore:
+    # One sorted int16 array per score component. Lookups are a binary search
+    # (np.searchsorted), so ranking against a million stored analyses stays
+    # in the microseconds; new rows are merged in from the database by
+    # created_at watermark instead of re-reading the table. numpy is imported
+    # on first use, off the app's import path; a component has an array once
+    # it has data.
+    def __init__(self):
+        self._sorted: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._watermark: Optional[datetime] = None
+        self._ids_at_watermark: Set = set()
+        self._refreshed_at = 0.0
+
+    def __len__(self) -> int:
+        arr = self._sorted.get("ats_score")
+        return 0 if arr is None else len(arr)
+
+    def add_many(self, rows: Iterable[Dict]) -> None:
+        columns: Dict[str, List[int]] = {c: [] for c in SCORE_COMPONENTS}
+        for scores in rows:
+            for c in SCORE_COMPONENTS:
+                value = scores.get(c)
+                if value is not None:
+                    columns[c].append(int(value))
+        import numpy as np
+
+        with self._lock:
+            for c, values in columns.items():
+                if not values:
+                    continue
+                new = np.sort(np.asarray(values, dtype=np.int16))
+                current = self._sorted.get(c)
+                if current is None:
+                    self._sorted[c] = new
+                else:
+                    self._sorted[c] = np.insert(current, np.searchsorted(current, new), new)
+
+    def percentiles(self, scores: Dict) -> Dict[str, Optional[float]]:
+        # Share of stored analyses scoring at or below each component, 0-100.
+        import numpy as np
+
+        result = {}
+        sorted_arrays = self._sorted
+        for c in SCORE_COMPONENTS:
+            arr = sorted_arrays.get(c)
+            value = scores.get(c)
+            if value is None or arr is None:
+                result[c] = None
+                continue
+            # Search with the array's own dtype; a mismatched needle makes
+            # numpy cast the whole array first, which turns O(log n) into O(n).
+            rank = np.searchsorted(arr, np.int16(value), side="right")
+            result[c] = round(float(rank) * 100.0 / len(arr), 1)
+        return result
+
+    def rank_many(self, component: str, values):
+        import numpy as np
+
+        arr = self._sorted.get(component)
+        if arr is None:
+            return np.full(len(values), np.nan)
+        ranks = np.searchsorted(arr, np.asarray(values, dtype=np.int16), side="right")
+        return ranks * 100.0 / len(arr)
+
+    def refresh(self, db: Session, batch_size: int = 5000) -> int:
+        query = db.query(
+            AnalysisResult.id,
+            AnalysisResult.created_at,
+            AnalysisResult.result_data,
+            AnalysisResult.score,
+        ).filter(AnalysisResult.analysis_type == "resume_analysis")
+        if self._watermark is not None:
+            query = query.filter(AnalysisResult.created_at >= self._watermark)
+
+        added = 0
+        batch: List[Dict] = []
+        for row_id, created_at, result_data, score in query.order_by(AnalysisResult.created_at).yield_per(batch_size):
+            if created_at == self._watermark and row_id in self._ids_at_watermark:
+                continue
+            if created_at != self._watermark:
+                self._watermark = created_at
+                self._ids_at_watermark = set()
+            self._ids_at_watermark.add(row_id)
+
+            try:
+                data = json.loads(result_data)
+            except (TypeError, ValueError):
+                data = {}
+            if score is not None:
+                data["ats_score"] = score
+            batch.append(data)
+            if len(batch) >= batch_size:
+                self.add_many(batch)
+                added += len(batch)
+                batch = []
+        if batch:
+            self.add_many(batch)
+            added += len(batch)
+        self._refreshed_at = time.monotonic()
+        return added
+
+    def refresh_if_stale(self) -> None:
+        # Never on a request's path: the first load in a worker reads the
+        # whole table, so it runs on a thread with its own session while
+        # requests keep using the current arrays (empty until it lands).
+        if time.monotonic() - self._refreshed_at < settings.percentile_refresh_seconds:
+            return
+        # One refresh at a time.
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        threading.Thread(target=self._refresh_in_background, name="percentile-refresh", daemon=True).start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            db = SessionLocal()
+            try:
+                self.refresh(db)
+            finally:
+                db.close()
+        except Exception as e:
+            # Percentiles are decoration; a failed refresh keeps the last data.
+            logger.warning(f"Percentile refresh failed: {e}")
+            self._refreshed_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+percentile_store = ScorePercentileStore()
@@ -0,0 +1,117 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# One heading classifier for the whole backend: the parser, the ATS scorer,
+# the PDF exporter and the agent prompts all segment a resume with it, so
+# they agree on where each section starts and ends.
+
+# canonical section -> headings that introduce it
+SECTION_ALIASES: Dict[str, List[str]] = {
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective"],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment",
+        "work history",
+    ],
+    "education": ["education", "academic", "academic background"],
+    "skills": [
+        "skills", "skill", "technical skills", "core competencies", "competencies",
+        "key skills", "expertise",
+    ],
+    "projects": ["projects", "project", "professional projects"],
+    "certifications": ["certifications", "certificates", "licenses"],
+    "languages": ["languages"],
+    "interests": ["interests", "activities"],
+    "volunteer": ["volunteer"],
+    "publications": ["publications"],
+    "awards": ["awards", "honors"],
+    "contact": ["contact", "personal information"],
+}
+
+_ALIAS_TO_SECTION = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+
+# The heading is whatever precedes the first colon ("Skills: Python, Go"), with
+# markdown/bullet decoration and a trailing date or count allowed around it
+# ("## Experience", "**EDUCATION**", "Projects (3)"). Longest aliases first so
+# "work experience" wins over "experience".
+_HEADING_RE = re.compile(
+    r"^[\W_]*(?P<alias>"
+    + "|".join(
+        r"\s+".join(map(re.escape, alias.split()))
+        for alias in sorted(_ALIAS_TO_SECTION, key=len, reverse=True)
+    )
+    + r")[\W\d_]*$",
+    re.IGNORECASE,
+)
+# Aliases that double as field labels: "Profile: linkedin.com/in/...",
+# "Contact: jane@example.com". With content after the colon they are part of
+# the header block; only on a line of their own do they start a section.
+_LABEL_ALIASES = frozenset({"profile", "contact", "personal information"})
+# Longer than any decorated alias: cannot be a heading, skip the regex.
+_MAX_HEADING_LEN = max(map(len, _ALIAS_TO_SECTION)) + 16
+
+
+class SectionSpan(NamedTuple):
+    section: str
+    heading: str
+    # Line numbers in text.split("\n"): the heading line, and one past the
+    # section's last line.
+    start: int
+    end: int
+
+
+def classify_heading(line: str) -> Optional[str]:
+    head = line.split(":", 1)[0].strip()
+    if not head or len(head) > _MAX_HEADING_LEN:
+        return None
+    alias = head.lower()
+    if alias not in _ALIAS_TO_SECTION:
+        m = _HEADING_RE.match(head)
+        if m is None:
+            return None
+        alias = " ".join(m.group("alias").lower().split())
+    if alias in _LABEL_ALIASES and inline_content(line):
+        return None
+    return _ALIAS_TO_SECTION[alias]
+
+
+def inline_content(line: str) -> str:
+    # "Skills: Python, Go" -> "Python, Go"
+    return line.split(":", 1)[1].strip() if ":" in line else ""
+
+
+def build_section_index(text: str) -> List[SectionSpan]:
+    lines = text.split("\n")
+    spans: List[SectionSpan] = []
+    for i, line in enumerate(lines):
+        section = classify_heading(line)
+        if section is None:
+            continue
+        if spans:
+            spans[-1] = spans[-1]._replace(end=i)
+        spans.append(SectionSpan(section, line.strip(), i, len(lines)))
+    return spans
+
+
+def section_index_from_data(resume_data: Optional[Dict], text: str) -> List[SectionSpan]:
+    # Reuse the index stored with the parsed resume when it still describes
+    # this text; rebuild it otherwise (edited or enhanced text).
+    stored = (resume_data or {}).get("section_index")
+    if stored:
+        spans = [SectionSpan(**s) if isinstance(s, dict) else SectionSpan(*s) for s in stored]
+        lines = text.split("\n")
+        if spans[-1].end == len(lines) and all(
+            s.start < len(lines) and lines[s.start].strip() == s.heading for s in spans
+        ):
+            return spans
+    return build_section_index(text)
+
+
+def section_outline(spans: List[SectionSpan]) -> str:
+    # "experience, education, skills" in document order, for prompts.
+    seen: List[str] = []
+    for span in spans:
+        if span.section not in seen:
+            seen.append(span.section)
+    return ", ".join(seen) if seen else "none detected"
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class _Flight:
+    __slots__ = ("loop", "task", "future", "waiters")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.task: Optional[asyncio.Task] = None
+        # Thread-safe, so callers on other event loops (the sync
+        # invoke_supervisor path runs one per call) can wait on it too.
+        self.future: Future = Future()
+        self.waiters = 0
+
+
+class SingleFlight:
+    # At most one upstream call per key at a time: concurrent callers with
+    # the same key wait for the first one's call and share its result (or
+    # its exception). A waiter that goes away only stops waiting; the call
+    # is cancelled once every waiter has gone.
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, label: str, outcome: str) -> None:
+        counts = self._nodes.setdefault(label, {"calls": 0, "coalesced": 0, "cancelled": 0})
+        counts[outcome] += 1
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], label: str = "default") -> Any:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight(loop)
+                self._count(label, "calls" if leader else "coalesced")
+                flight.waiters += 1
+            if leader:
+                flight.task = loop.create_task(fn())
+                flight.task.add_done_callback(lambda task, key=key, flight=flight: self._settle(key, flight, task))
+            # This waiter's own view of the call. shield keeps our own
+            # cancellation from reaching it, so if it ends up cancelled it
+            # was the shared call that was (Task.cancelling() would say
+            # which, but only from 3.11).
+            waiter = asyncio.wrap_future(flight.future)
+            try:
+                return await asyncio.shield(waiter)
+            except asyncio.CancelledError:
+                if waiter.cancelled():
+                    # The call was cancelled under us (its caller's event loop
+                    # shut down) while we still want the answer: make our own.
+                    continue
+                raise
+            finally:
+                self._leave(flight, label)
+
+    def _leave(self, flight: _Flight, label: str) -> None:
+        with self._lock:
+            flight.waiters -= 1
+            if flight.waiters or flight.future.done() or flight.task is None:
+                return
+            self._count(label, "cancelled")
+        try:
+            flight.loop.call_soon_threadsafe(flight.task.cancel)
+        except RuntimeError:
+            # That loop is closed, and took the task down with it.
+            pass
+
+    def _settle(self, key: Hashable, flight: _Flight, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if task.cancelled():
+            flight.future.cancel()
+        elif task.exception() is not None:
+            flight.future.set_exception(task.exception())
+        else:
+            flight.future.set_result(task.result())
+
+    def stats(self) -> Dict:
+        totals = {"calls": 0, "coalesced": 0, "cancelled": 0}
+        for counts in self._nodes.values():
+            for outcome, n in counts.items():
+                totals[outcome] += n
+        return {"in_flight": len(self._flights), **totals, "nodes": dict(self._nodes)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,170 @@
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+from app.core.config import settings
+
+DEFAULT_TAXONOMY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "skills_taxonomy.json"
+)
+
+# Tokens are runs of letters/digits optionally trailed by "+"/"#" ("c++",
+# "c#"). Matching happens on whole tokens, so "go" never fires inside "google"
+# and "api" never fires inside "rapid".
+_TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+_TOKEN_SPLIT_RE = re.compile(r"([a-z0-9]+[+#]*)")
+# Characters allowed between the tokens of a multi-word skill ("ci/cd",
+# "node.js", "scikit-learn", "power bi"). Anything else, e.g. a comma, breaks
+# the phrase.
+_PHRASE_GAP_CHARS = frozenset(" \t-/.")
+
+
+class SkillMatch(NamedTuple):
+    skill_id: str
+    start: int
+    end: int
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _lower_same_length(text: str) -> str:
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    # A few non-ASCII characters grow when lowercased ("İ"); leave those as-is
+    # so match offsets stay valid for the original text.
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def load_taxonomy(path: str) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["skills"] if isinstance(data, dict) else data
+
+
+# Aho-Corasick automaton over word tokens. Each taxonomy term (a skill id or
+# one of its aliases) is a path of tokens through the trie; a scan walks every
+# token of the input once, so cost tracks input length, not vocabulary size.
+class SkillMatcher:
+    def __init__(self, skills: Iterable[dict]):
+        self.names: Dict[str, str] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (skill_id, term length in tokens, needs a leading dot) for
+        # every term ending there. Dotted terms (".net") only match after ".".
+        self._out: List[List[Tuple[str, int, bool]]] = [[]]
+
+        for skill in skills:
+            skill_id = skill["id"]
+            self.names[skill_id] = skill.get("name", skill_id)
+            for term in [skill_id, *skill.get("aliases", [])]:
+                self._add_term(_tokenize(term), skill_id, term.startswith("."))
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _add_term(self, tokens: List[str], skill_id: str, dotted: bool) -> None:
+        if not tokens:
+            return
+        state = 0
+        for tok in tokens:
+            nxt = self._goto[state].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        entry = (skill_id, len(tokens), dotted)
+        if entry not in self._out[state]:
+            self._out[state].append(entry)
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for tok, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and tok not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(tok, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def _scan(self, parts: List[str]) -> Iterator[Tuple[str, int, int, bool]]:
+        # parts alternates gap, token, gap, ..., token, gap (re.split with a
+        # capture group), so token i is parts[2i + 1] and the text before it
+        # is parts[2i]. Yields (skill_id, first token, last token, dotted).
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        state = 0
+        for i in range(len(parts) // 2):
+            tok = parts[2 * i + 1]
+            if not state and tok not in root:
+                continue
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0)
+            for skill_id, length, dotted in out[state]:
+                first = i - length + 1
+                before = parts[2 * first]
+                if dotted:
+                    if not before.endswith("."):
+                        continue
+                elif before == "." and first:
+                    # The tail of a dotted compound: "js" in "node.js".
+                    continue
+                if length > 1 and not all(
+                    _PHRASE_GAP_CHARS.issuperset(parts[2 * k]) for k in range(first + 1, i + 1)
+                ):
+                    continue
+                yield skill_id, first, i, dotted
+
+    def _resolve(self, parts: List[str]) -> List[Tuple[str, int, int, bool]]:
+        # Leftmost-longest: of the matches starting at the leftmost token the
+        # longest wins, and anything overlapping it is dropped. "node.js" is
+        # one node match, not "node" plus "node.js"; "asp.net" is one .net.
+        matches = sorted(set(self._scan(parts)), key=lambda m: (m[1], -m[2]))
+        resolved = []
+        next_free = 0
+        for match in matches:
+            if match[1] >= next_free:
+                resolved.append(match)
+                next_free = match[2] + 1
+        return resolved
+
+    def find(self, text: str) -> List[SkillMatch]:
+        parts = _TOKEN_SPLIT_RE.split(_lower_same_length(text))
+        offsets = [0]
+        matches = []
+        for skill_id, first, last, dotted in self._resolve(parts):
+            # Token start offsets are resolved lazily, up to the latest match.
+            while len(offsets) <= 2 * last + 1:
+                offsets.append(offsets[-1] + len(parts[len(offsets) - 1]))
+            start = offsets[2 * first + 1] - dotted
+            end = offsets[2 * last + 1] + len(parts[2 * last + 1])
+            matches.append(SkillMatch(skill_id, start, end))
+        return matches
+
+    def skill_ids(self, text: str) -> Set[str]:
+        parts = _TOKEN_SPLIT_RE.split(_lower_same_length(text))
+        return {match[0] for match in self._resolve(parts)}
+
+    def skill_names(self, text: str) -> List[str]:
+        seen = []
+        for m in self.find(text):
+            name = self.names[m.skill_id]
+            if name not in seen:
+                seen.append(name)
+        return seen
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    return SkillMatcher(load_taxonomy(settings.skills_taxonomy_path or DEFAULT_TAXONOMY_PATH))
@@ -1,13 +1,9 @@
 import json
-from typing import AsyncGenerator
-from langchain_google_genai import ChatGoogleGenerativeAI
-from app.core.config import settings
+from typing import Any, AsyncGenerator, AsyncIterator, Iterable, NamedTuple, Optional
+from app.services.llm_registry import get_llm
+from app.services.partial_json import IncrementalJSONParser, Path
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.4,
-    google_api_key=settings.google_api_key,
-)
+llm = get_llm(temperature=0.4)
 
 
 async def stream_chat_response(
@@ -23,3 +19,34 @@ async def stream_chat_response(
         if chunk.content:
             yield f"data: {json.dumps({'token': chunk.content})}\n\n"
     yield "data: [DONE]\n\n"
+
+
+class StructuredEvent(NamedTuple):
+    # "field": one completed value (path "tone_variants.0"), "result": the
+    # validated output and its raw data, "error": a message
+    kind: str
+    path: str = ""
+    value: Any = None
+    data: Optional[dict] = None
+
+
+async def stream_structured(
+    model,
+    prompt: Any,
+    fields: Iterable[Path],
+    error_prefix: str = "Generation failed",
+) -> AsyncIterator[StructuredEvent]:
+    # Streams a StructuredModel's answer: each watched field is sent as soon
+    # as the model has finished writing it, then the whole response is
+    # parsed (and repaired if need be) and validated like the node does.
+    parser = IncrementalJSONParser(fields)
+    try:
+        async for chunk in model.astream(prompt):
+            if chunk.content:
+                for path, value in parser.feed(chunk.content):
+                    yield StructuredEvent("field", ".".join(map(str, path)), value)
+        output, data = model.parse(parser.text)
+    except Exception as e:
+        yield StructuredEvent("error", value=f"{error_prefix}: {str(e)}")
+        return
+    yield StructuredEvent("result", value=output, data=data)
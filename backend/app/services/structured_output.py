@@ -0,0 +1,192 @@
+import json
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from app.services.llm_cache import CachedModel
+
+_CLOSERS = {"{": "}", "[": "]"}
+_BARE_WORDS = {"True": "true", "False": "false", "None": "null"}
+
+
+class StructuredOutputError(ValueError):
+    pass
+
+
+def repair_json(text: str) -> Any:
+    # Best-effort read of the first JSON object in a model response. Handles
+    # what models actually send back: prose or ``` fences around the object,
+    # trailing commas, unquoted keys, Python's True/False/None, raw newlines
+    # inside strings, and output cut off mid-document (open strings and
+    # containers are closed, a dangling key gets null).
+    start = text.find("{")
+    if start < 0:
+        raise StructuredOutputError("No JSON object in the response")
+    out: List[str] = []
+    # Per open container: its opener and what comes next (see partial_json).
+    stack: List[List[str]] = []
+    in_string = escape = False
+    i, n = start, len(text)
+    while i < n:
+        c = text[i]
+        if in_string:
+            out.append(c)
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+                frame = stack[-1]
+                frame[1] = "colon" if frame[1] == "key" else "comma"
+            i += 1
+            continue
+        if c == '"':
+            in_string = True
+        elif c in "{[":
+            if stack:
+                stack[-1][1] = "comma"
+            stack.append([c, "key" if c == "{" else "value"])
+        elif c in "}]":
+            _drop_trailing_comma(out)
+            opener = stack.pop()[0]
+            out.append(_CLOSERS[opener])
+            if not stack:
+                break
+            i += 1
+            continue
+        elif c == ":":
+            stack[-1][1] = "value"
+        elif c == ",":
+            stack[-1][1] = "key" if stack[-1][0] == "{" else "value"
+        elif c.isalpha():
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            if stack[-1][1] == "key":
+                # Unquoted key.
+                out.append(f'"{word}"')
+                stack[-1][1] = "colon"
+            else:
+                out.append(_BARE_WORDS.get(word, word))
+                stack[-1][1] = "comma"
+            i = j
+            continue
+        elif not c.isspace():
+            stack[-1][1] = "comma"
+        out.append(c)
+        i += 1
+
+    if stack:
+        # Truncated: finish the open string, then whatever the last open
+        # container was waiting for, then close every container.
+        if in_string:
+            if escape:
+                out.pop()
+            out.append('"')
+            frame = stack[-1]
+            frame[1] = "colon" if frame[1] == "key" else "comma"
+        _drop_trailing_comma(out)
+        state = stack[-1][1]
+        if state == "colon":
+            out.append(":null")
+        elif state == "value" and stack[-1][0] == "{":
+            out.append("null")
+        for opener, _ in reversed(stack):
+            _drop_trailing_comma(out)
+            out.append(_CLOSERS[opener])
+    try:
+        return json.loads("".join(out), strict=False)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Unrepairable JSON: {e}") from None
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+class StructuredOutputStats:
+    # Per node: how often the response parsed as-is, needed repair, or was
+    # lost (no usable object, or it failed the schema).
+    def __init__(self):
+        self._nodes: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, node: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._nodes.setdefault(node, {"clean": 0, "repaired": 0, "failed": 0})
+            counts[outcome] += 1
+
+    def stats(self) -> Dict:
+        nodes = {}
+        for node, counts in self._nodes.items():
+            total = sum(counts.values())
+            nodes[node] = {
+                **counts,
+                "repair_rate": round(counts["repaired"] / total, 4) if total else 0.0,
+                "failure_rate": round(counts["failed"] / total, 4) if total else 0.0,
+            }
+        return {"nodes": nodes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+
+structured_output_stats = StructuredOutputStats()
+
+
+def parse_structured(text: str, schema: Optional[Type[BaseModel]], node: str) -> Tuple[Any, Dict]:
+    # -> (output, data): the schema instance (or the dict when there is no
+    # schema) and its JSON-ready dict for analysis_results.
+    outcome = "clean"
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        outcome = "repaired"
+        try:
+            data = repair_json(text)
+        except StructuredOutputError:
+            structured_output_stats.record(node, "failed")
+            raise
+    try:
+        if not isinstance(data, dict):
+            raise StructuredOutputError(f"Expected a JSON object, got {type(data).__name__}")
+        output = schema.model_validate(data) if schema is not None else data
+    except (ValidationError, StructuredOutputError):
+        structured_output_stats.record(node, "failed")
+        raise
+    structured_output_stats.record(node, outcome)
+    if outcome == "repaired":
+        logger.debug(f"Repaired {node} JSON response")
+    if schema is not None:
+        data = output.model_dump(mode="json")
+    return output, data
+
+
+class StructuredModel:
+    # The one way JSON-answering agents call the model. With a schema the
+    # request runs in Gemini's JSON mode constrained to it (what
+    # with_structured_output binds), but the text comes back unparsed, so
+    # it can be streamed, cached as text, and repaired locally instead of
+    # the whole paid call failing on one bad character.
+    def __init__(self, llm, node: str, schema: Optional[Type[BaseModel]] = None):
+        self.node = node
+        self.schema = schema
+        self.model = CachedModel(llm.json_output(schema) if schema is not None else llm, node)
+
+    def parse(self, text: str) -> Tuple[Any, Dict]:
+        return parse_structured(text, self.schema, self.node)
+
+    async def ainvoke(self, prompt: Any) -> Tuple[Any, Dict]:
+        return self.parse((await self.model.ainvoke(prompt)).content)
+
+    async def astream(self, prompt: Any) -> AsyncIterator:
+        async for chunk in self.model.astream(prompt):
+            yield chunk
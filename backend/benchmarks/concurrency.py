@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from benchmarks.run import _percentile
+
+# In-flight capacity of one worker for /agent/invoke with a slow fake LLM.
+#
+#   python -m benchmarks.concurrency --requests 5000 --latency 2
+#
+# Requests go through the ASGI app in-process (no sockets), so the numbers
+# measure how many LLM calls the worker can keep waiting at once, not the
+# HTTP stack. Run from backend/ with the usual .env.
+
+
+class FakeChat:
+    # Answers after a fixed delay and records how many calls overlap.
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+
+    def _reply(self):
+        return SimpleNamespace(content="Quantify the impact of your last two roles.")
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return self._reply()
+
+    def invoke(self, messages, *args, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return self._reply()
+
+
+async def _run(requests: int, latency: float) -> Dict:
+    import httpx
+    from app.agents import resume_chat_agent
+    from app.main import create_app
+
+    llm = FakeChat(latency)
+    resume_chat_agent.llm = llm
+    body = {
+        "session_id": "bench",
+        "intent": "chat",
+        "resume_text": "Jane Doe\nBackend engineer, 6 years of Python and AWS.",
+        "user_message": "What should I improve?",
+    }
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+
+        async def one() -> float:
+            start = time.perf_counter()
+            resp = await client.post("/api/v1/agent/invoke", json=body)
+            resp.raise_for_status()
+            return time.perf_counter() - start
+
+        started = time.perf_counter()
+        latencies: List[float] = sorted(await asyncio.gather(*(one() for _ in range(requests))))
+        wall = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "llm_latency_s": latency,
+        "peak_in_flight": llm.peak,
+        "wall_s": round(wall, 2),
+        "requests_per_sec": round(requests / wall, 1),
+        "p50_s": round(_percentile(latencies, 50), 2),
+        "p99_s": round(_percentile(latencies, 99), 2),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HireLens agent concurrency benchmark")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=2.0, help="fake LLM latency in seconds")
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(_run(args.requests, args.latency)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from benchmarks.synthetic import generate_corpus
+
+# Hot-path benchmarks for the scoring, parsing and export modules.
+#
+#   python -m benchmarks.run --output benchmarks/baseline.json
+#   python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.15
+#
+# Run from backend/ with the usual .env (the app settings are loaded on import).
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+SIZES = {
+    "small": dict(lines=40),
+    "medium": dict(lines=120),
+    "large": dict(lines=600, table_density=0.1, keyword_density=0.3),
+}
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Returns (fn, reset): fn(text) is timed, reset() runs untimed before each
+    # call so caches do not turn the measurement into a dict lookup.
+    load: Callable[[], Tuple[Callable[[str], object], Optional[Callable[[], None]]]]
+    # Optional untimed conversion of each synthetic resume into the input the
+    # function takes (e.g. DOCX bytes).
+    prepare: Optional[Callable[[str], object]] = None
+
+
+def _ats_scorer():
+    from app.services.ats_scorer import compute_ats_scores, line_feature_cache
+    return compute_ats_scores, line_feature_cache.clear
+
+
+def _parse_resume_text():
+    from app.services.resume_parser import parse_resume_text
+    return parse_resume_text, None
+
+
+def _build_resume_story():
+    from reportlab.lib.styles import getSampleStyleSheet
+    from app.api.v1.export import _build_resume_story
+    styles = getSampleStyleSheet()
+    return (lambda text: _build_resume_story(text, styles)), None
+
+
+def _extract_text_from_docx():
+    from app.services.resume_parser import extract_text_from_docx
+    return extract_text_from_docx, None
+
+
+def _to_docx(text: str) -> bytes:
+    from io import BytesIO
+    from docx import Document
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _extract_text_from_pdf():
+    from app.services.resume_parser import extract_text_from_pdf
+    return (lambda data: extract_text_from_pdf(data, parallel=False)), None
+
+
+def _to_pdf(text: str) -> bytes:
+    from io import BytesIO
+    from reportlab.pdfgen import canvas
+    buf = BytesIO()
+    c = canvas.Canvas(buf)
+    y = 800
+    for line in text.split("\n"):
+        c.drawString(40, y, line[:110])
+        y -= 12
+        if y < 40:
+            c.showPage()
+            y = 800
+    c.save()
+    return buf.getvalue()
+
+
+BENCHMARKS = [
+    Benchmark("ats_scorer.compute_ats_scores", _ats_scorer),
+    Benchmark("resume_parser.parse_resume_text", _parse_resume_text),
+    Benchmark("export._build_resume_story", _build_resume_story),
+    Benchmark("resume_parser.extract_text_from_docx", _extract_text_from_docx, _to_docx),
+    Benchmark("resume_parser.extract_text_from_pdf", _extract_text_from_pdf, _to_pdf),
+]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(fn, reset, inputs: List, rounds: int) -> Dict:
+    for text in inputs:
+        if reset:
+            reset()
+        fn(text)
+
+    timings: List[int] = []
+    round_medians: List[float] = []
+    for _ in range(rounds):
+        round_timings = []
+        for text in inputs:
+            if reset:
+                reset()
+            start = time.perf_counter_ns()
+            fn(text)
+            round_timings.append(time.perf_counter_ns() - start)
+        timings.extend(round_timings)
+        round_medians.append(_percentile(sorted(round_timings), 50))
+    timings.sort()
+
+    # Allocation pass is separate: tracemalloc slows every allocation down.
+    peaks = []
+    tracemalloc.start()
+    try:
+        for text in inputs:
+            if reset:
+                reset()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            fn(text)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+    finally:
+        tracemalloc.stop()
+    peaks.sort()
+
+    total_s = sum(timings) / 1e9
+    return {
+        "calls": len(timings),
+        "ops_per_sec": round(len(timings) / total_s, 1) if total_s else 0.0,
+        "p50_us": round(_percentile(timings, 50) / 1000, 1),
+        "p99_us": round(_percentile(timings, 99) / 1000, 1),
+        # Median of the quietest round; what --compare checks, since it shrugs
+        # off bursts of interference from other processes on the machine.
+        "best_p50_us": round(min(round_medians) / 1000, 1),
+        "alloc_peak_kib": round(_percentile(peaks, 50) / 1024, 1),
+    }
+
+
+def run(seed: int = 0, corpus_size: int = 30, rounds: int = 5, only: Optional[str] = None) -> Dict:
+    corpora = {
+        size: generate_corpus(corpus_size, seed=seed, **params) for size, params in SIZES.items()
+    }
+    results = {}
+    for bench in BENCHMARKS:
+        if only and only not in bench.name:
+            continue
+        fn, reset = bench.load()
+        for size, inputs in corpora.items():
+            if bench.prepare:
+                inputs = [bench.prepare(text) for text in inputs]
+            results[f"{bench.name}[{size}]"] = measure(fn, reset, inputs, rounds)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "corpus_size": corpus_size,
+            "rounds": rounds,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    # A case regresses when its best-round p50 latency or peak allocation
+    # grows by more than the threshold (0.15 = 15%) over the baseline.
+    regressions = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric in ("best_p50_us", "alloc_peak_kib"):
+            if before[metric] and now[metric] > before[metric] * (1 + threshold):
+                change = (now[metric] / before[metric] - 1) * 100
+                regressions.append(f"{name} {metric}: {before[metric]} -> {now[metric]} (+{change:.0f}%)")
+    return regressions
+
+
+def _print_table(report: Dict, baseline: Optional[Dict]) -> None:
+    print(f"{'benchmark':<48} {'ops/s':>10} {'p50 us':>10} {'p99 us':>10} {'alloc KiB':>10} {'vs base':>8}")
+    for name, r in report["results"].items():
+        delta = ""
+        before = baseline["results"].get(name) if baseline else None
+        if before and before["best_p50_us"]:
+            delta = f"{(r['best_p50_us'] / before['best_p50_us'] - 1) * 100:+.0f}%"
+        print(
+            f"{name:<48} {r['ops_per_sec']:>10} {r['p50_us']:>10} {r['p99_us']:>10} "
+            f"{r['alloc_peak_kib']:>10} {delta:>8}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HireLens hot-path benchmarks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus-size", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--only", help="run benchmarks whose name contains this string")
+    parser.add_argument("--output", help="write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    report = run(args.seed, args.corpus_size, args.rounds, args.only)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_table(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if baseline:
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import random
+from typing import List
+
+# Seeded resume-shaped text for benchmarks. Same arguments, same text, so
+# numbers from two runs are measured on identical inputs.
+
+FIRST_NAMES = ["Ayesha", "Daniel", "Fatima", "Lucas", "Mei", "Omar", "Priya", "Sofia", "Tom", "Zara"]
+LAST_NAMES = ["Ahmed", "Becker", "Chen", "Garcia", "Khan", "Novak", "Okafor", "Patel", "Silva", "Wright"]
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "DevOps Engineer", "Product Analyst"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries"]
+
+SECTIONS = ["Professional Summary", "Work Experience", "Projects", "Education", "Technical Skills", "Certifications"]
+
+VERBS = ["Led", "Built", "Designed", "Implemented", "Reduced", "Improved", "Migrated", "Automated", "Launched"]
+KEYWORDS = [
+    "Python", "React", "AWS", "Docker", "Kubernetes", "PostgreSQL", "FastAPI", "TypeScript",
+    "machine learning", "CI/CD", "Redis", "GraphQL", "Terraform", "Node.js", "TensorFlow",
+]
+FILLER = [
+    "the", "team", "service", "platform", "customers", "pipeline", "internal", "tooling",
+    "reporting", "workflow", "across", "several", "regions", "with", "for", "and", "new",
+]
+METRICS = ["by 35%", "for 2M users", "saving $120K a year", "from 9s to 400ms", "across 12 teams", "in 3 months"]
+BULLETS = ["•", "-", "*", "▪"]
+
+
+def _sentence(rng: random.Random, keyword_density: float, words: int) -> str:
+    out = [rng.choice(VERBS)]
+    for _ in range(words):
+        out.append(rng.choice(KEYWORDS) if rng.random() < keyword_density else rng.choice(FILLER))
+    if rng.random() < 0.5:
+        out.append(rng.choice(METRICS))
+    return " ".join(out)
+
+
+def _table_line(rng: random.Random) -> str:
+    cells = [rng.choice(KEYWORDS) for _ in range(rng.randint(3, 5))]
+    return rng.choice([" | ", "\t"]).join(cells)
+
+
+def generate_resume(
+    seed: int = 0,
+    lines: int = 60,
+    bullet_density: float = 0.5,
+    table_density: float = 0.05,
+    keyword_density: float = 0.2,
+) -> str:
+    rng = random.Random(seed)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", "")
+    out: List[str] = [
+        name,
+        rng.choice(TITLES),
+        f"{handle}@example.com | +1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        f"linkedin.com/in/{handle} | github.com/{handle}",
+        "",
+    ]
+
+    section_every = max(lines // len(SECTIONS), 4)
+    section = 0
+    while len(out) < lines:
+        if (len(out) - 5) % section_every == 0 and section < len(SECTIONS):
+            if section:
+                out.append("")
+            out.append(SECTIONS[section])
+            if SECTIONS[section] in ("Work Experience", "Projects"):
+                out.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} | 20{rng.randint(10, 23)} - Present")
+            section += 1
+            continue
+        roll = rng.random()
+        if roll < table_density:
+            out.append(_table_line(rng))
+        elif roll < table_density + bullet_density:
+            out.append(f"{rng.choice(BULLETS)} {_sentence(rng, keyword_density, rng.randint(6, 18))}")
+        else:
+            out.append(_sentence(rng, keyword_density, rng.randint(10, 30)) + ".")
+    return "\n".join(out[:lines])
+
+
+def generate_corpus(count: int, seed: int = 0, **kwargs) -> List[str]:
+    return [generate_resume(seed + i, **kwargs) for i in range(count)]
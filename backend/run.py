@@ -1,4 +1,11 @@
 import uvicorn
 
 if __name__ == "__main__":
+    from loguru import logger
+    from app.core.database import init_db
+
+    try:
+        init_db()
+    except Exception as e:
+        logger.warning(f"Skipping schema creation: {e}")
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
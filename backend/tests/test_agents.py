@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from app.agents.types import AgentState
 
@@ -22,8 +23,8 @@ def make_state(overrides=None):
 
 
 def test_supervisor_graph_structure():
-    from app.agents.supervisor import supervisor_agent
-    nodes = list(supervisor_agent.get_graph().nodes.keys())
+    from app.agents.supervisor import get_supervisor_agent
+    nodes = list(get_supervisor_agent().get_graph().nodes.keys())
     expected = ["__start__", "router", "analyze", "chat", "job_match", "ats", "cover_letter", "interview_prep", "mock_interview", "career_path", "__end__"]
     for node in expected:
         assert node in nodes, f"Missing node: {node}"
@@ -209,3 +210,186 @@ def test_resume_parser():
     result = parse_resume_text(text)
     assert result.name == "John Doe"
     assert result.email == "john@email.com"
+
+
+def test_resume_analysis_makes_one_llm_call(monkeypatch):
+    from app.agents import resume_agent as agent
+
+    calls = []
+
+    class StubStructured:
+        async def ainvoke(self, prompt):
+            calls.append("structured")
+            return agent.ResumeQualitative(
+                summary="Backend engineer.\nFive years of Python.\nShips APIs.",
+                strengths=["Python"], weaknesses=[], improvement_tips=[], suggested_roles=["Backend Engineer"],
+            )
+
+    class StubPlain:
+        async def ainvoke(self, prompt):
+            calls.append("plain")
+            raise AssertionError("summary call should not run")
+
+    monkeypatch.setattr(agent, "_structured_llm", StubStructured())
+    monkeypatch.setattr(agent, "_llm_general", StubPlain())
+
+    legacy = asyncio.run(agent.get_resume_agent().ainvoke({"resume_text": make_state()["resume_text"]}))
+    node = asyncio.run(agent.analyze_resume_node(make_state()))
+    assert calls == ["structured", "structured"]
+    assert legacy["output"].summary == node["output"].summary == "Backend engineer.\nFive years of Python.\nShips APIs."
+    assert legacy["summary"] == legacy["output"].summary
+
+
+def test_resume_analysis_falls_back_to_plain_summary(monkeypatch):
+    from types import SimpleNamespace
+    from app.agents import resume_agent as agent
+
+    class FailingStructured:
+        async def ainvoke(self, prompt):
+            raise ValueError("unparseable")
+
+    class StubPlain:
+        async def ainvoke(self, prompt):
+            return SimpleNamespace(content=" Plain summary. ")
+
+    monkeypatch.setattr(agent, "_structured_llm", FailingStructured())
+    monkeypatch.setattr(agent, "_llm_general", StubPlain())
+    result = asyncio.run(agent.analyze_resume_node(make_state()))
+    assert result["output"].summary == "Plain summary."
+    assert result["output"].strengths == []
+
+
+class _SlowChat:
+    # Stands in for a chat model: answers after a fixed delay.
+    def __init__(self, latency):
+        self.latency = latency
+        self.in_flight = self.peak = 0
+
+    async def ainvoke(self, messages):
+        from types import SimpleNamespace
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        return SimpleNamespace(content="Lead with your AWS work.")
+
+
+def test_supervisor_sync_shim_and_concurrent_ainvoke(monkeypatch):
+    import time
+    from app.agents import resume_chat_agent
+    from app.agents.supervisor import get_supervisor_agent, invoke_supervisor
+
+    llm = _SlowChat(0.2)
+    monkeypatch.setattr(resume_chat_agent, "llm", llm)
+    state = make_state({"active_agent": "chat", "user_message": "What should I improve?"})
+
+    result = invoke_supervisor(state)
+    assert result["output"]["reply"] == "Lead with your AWS work."
+
+    async def burst():
+        return await asyncio.gather(*(get_supervisor_agent().ainvoke(dict(state)) for _ in range(200)))
+
+    started = time.monotonic()
+    results = asyncio.run(burst())
+    assert len(results) == 200
+    assert llm.peak == 200
+    assert time.monotonic() - started < 5
+
+
+class _SlowReply:
+    # Answers a structured or plain call after a delay; raises if given an exception.
+    def __init__(self, latency, reply):
+        self.latency = latency
+        self.reply = reply
+
+    async def ainvoke(self, prompt):
+        from types import SimpleNamespace
+        await asyncio.sleep(self.latency)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return self.reply if not isinstance(self.reply, str) else SimpleNamespace(content=self.reply)
+
+
+def _stub_report_agents(monkeypatch, latency, career_path=None):
+    import json
+    from app.agents import ats_agent, career_path_agent, interview_agent, job_matching_agent, resume_agent
+
+    monkeypatch.setattr(resume_agent, "_structured_llm", _SlowReply(latency, resume_agent.ResumeQualitative(
+        summary="Backend engineer.", strengths=["Python"], weaknesses=[], improvement_tips=[], suggested_roles=[],
+    )))
+    monkeypatch.setattr(ats_agent, "_structured_llm", _SlowReply(latency, ats_agent.QualitativeAnalysis(
+        critical_issues=[], warnings=[], suggestions=[], summary="Parses cleanly.",
+        missing_keywords=["Kubernetes"], keyword_suggestions=[],
+    )))
+    monkeypatch.setattr(job_matching_agent.llm, "model", _SlowReply(latency, json.dumps({
+        "match_percentage": 80, "matched_keywords": ["Python"], "missing_keywords": [],
+        "skill_gaps": [], "overall_assessment": "Strong match.",
+    })))
+    monkeypatch.setattr(career_path_agent.llm, "model", career_path or _SlowReply(latency, json.dumps({
+        "target_role": "Staff Engineer", "skill_gaps": [], "certifications": [],
+        "learning_roadmap": [], "estimated_timeline": "2 years",
+    })))
+    monkeypatch.setattr(interview_agent._prep_llm, "model", _SlowReply(latency, json.dumps({
+        "target_role": "Backend Engineer", "questions": [], "preparation_tips": "Practice system design.",
+    })))
+
+
+def test_full_report_runs_branches_in_parallel(monkeypatch):
+    import time
+    from app.agents.supervisor import invoke_supervisor
+
+    _stub_report_agents(monkeypatch, 0.3)
+    state = make_state({"active_agent": "full_report", "job_description": "Senior Python engineer, AWS"})
+
+    started = time.monotonic()
+    result = invoke_supervisor(state)
+    elapsed = time.monotonic() - started
+
+    # Five 0.3s branches: about one branch's latency, not the 1.5s sum.
+    assert elapsed < 1.0
+    assert result["error"] == ""
+    assert list(result["output"]["results"]) == ["analyze", "ats", "job_match", "career_path", "interview_prep"]
+    assert result["output"]["errors"] == {} and result["output"]["skipped"] == []
+    assert {"job_matching", "career_path", "interview_prep"} <= set(result["analysis_results"])
+    assert result["analysis_results"]["ats_score"] == result["output"]["results"]["analyze"].ats_score
+    assert result["resume_data"]["section_index"] is not None
+
+
+def test_full_report_merge_keeps_fresh_results_over_session_ones(monkeypatch):
+    from app.agents.supervisor import invoke_supervisor
+
+    _stub_report_agents(monkeypatch, 0.01)
+    stale = {"ats": "OLD", "job_matching": "OLD", "summary": "OLD", "cover_letter": "kept"}
+    result = invoke_supervisor(make_state({
+        "active_agent": "full_report",
+        "job_description": "Senior Python engineer, AWS",
+        "analysis_results": stale,
+    }))
+
+    merged = result["analysis_results"]
+    assert merged["ats"]["missing_keywords"] == ["Kubernetes"]
+    assert merged["job_matching"]["match_percentage"] == 80
+    assert merged["summary"] == "Backend engineer."
+    assert merged["cover_letter"] == "kept"
+
+
+def test_full_report_keeps_partial_results(monkeypatch):
+    from app.agents.supervisor import invoke_supervisor
+    from app.core.config import settings
+
+    _stub_report_agents(monkeypatch, 0.01, career_path=_SlowReply(5, "{}"))
+    monkeypatch.setattr(settings, "full_report_branch_timeout_seconds", 0.2)
+    result = invoke_supervisor(make_state({"active_agent": "full_report"}))
+
+    # No job description: job_match is skipped; career_path times out.
+    assert set(result["output"]["results"]) == {"analyze", "ats", "interview_prep"}
+    assert result["output"]["skipped"] == ["job_match"]
+    assert "Timed out" in result["output"]["errors"]["career_path"]
+    assert result["error"] == ""
+
+    _stub_report_agents(monkeypatch, 0.01, career_path=_SlowReply(0.01, RuntimeError("quota exceeded")))
+    result = invoke_supervisor(make_state({"active_agent": "full_report"}))
+    assert "quota exceeded" in result["output"]["errors"]["career_path"]
+
+    result = invoke_supervisor(make_state({"active_agent": "full_report", "resume_text": " "}))
+    assert result["error"] == "No resume found. Upload a resume first."
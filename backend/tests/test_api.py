@@ -15,16 +15,19 @@ def test_all_routes_registered():
         "/api/v1/export/cover-letter",
         "/api/v1/export/report",
         "/api/v1/health/",
+        "/api/v1/health/metrics",
         "/api/v1/resume/upload",
         "/api/v1/resume/analyze",
         "/api/v1/resume/upload-and-analyze",
         "/api/v1/resume/chat/",
         "/api/v1/stream/chat",
+        "/api/v1/stream/agent",
         "/api/v1/subscriptions/create-checkout",
         "/api/v1/subscriptions/webhook",
         "/api/v1/subscriptions/status",
         "/api/v1/dashboard",
         "/api/v1/history",
+        "/api/v1/ats/score-batch",
     ]
     for route in expected:
         assert route in routes, f"Missing route: {route}"
@@ -65,3 +68,146 @@ def test_subscription_routes_exist():
 def test_stream_route_exists():
     paths = [r.path for r in app.routes]
     assert "/api/v1/stream/chat" in paths
+    assert "/api/v1/stream/agent" in paths
+
+
+def test_stream_agent_sends_fields_before_the_result(monkeypatch):
+    import asyncio
+    import json
+    from types import SimpleNamespace
+    from fastapi.testclient import TestClient
+    from app.agents import cover_letter_agent
+    from app.core.security import get_current_user
+    from app.state.session_store import SESSION_STORE
+
+    letter = {
+        "primary_letter": "Dear team,\nI build \"reliable\" APIs.",
+        "tone_variants": [{"tone": "formal", "content": "A"}, {"tone": "concise", "content": "B"}],
+    }
+    response = "```json\n" + json.dumps(letter, indent=2) + "\n```"
+
+    class StreamingChat:
+        async def astream(self, prompt):
+            for i in range(0, len(response), 7):
+                await asyncio.sleep(0)
+                yield SimpleNamespace(content=response[i:i + 7])
+
+    monkeypatch.setattr(cover_letter_agent.llm.model, "runnable", StreamingChat())
+    app = create_app()
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="u1")
+    client = TestClient(app)
+
+    body = {"session_id": "stream-test", "intent": "cover_letter", "resume_text": "Jane Doe\nPython engineer"}
+    with client.stream("POST", "/api/v1/stream/agent", json=body) as resp:
+        assert resp.status_code == 200
+        events, event = [], None
+        for line in resp.iter_lines():
+            if line.startswith("event:"):
+                event = line.split(":", 1)[1].strip()
+            elif line.startswith("data:"):
+                events.append((event, json.loads(line.split(":", 1)[1])))
+
+    assert [(e, d.get("path")) for e, d in events] == [
+        ("field", "primary_letter"), ("field", "tone_variants.0"), ("field", "tone_variants.1"), ("result", None),
+    ]
+    assert events[0][1]["value"] == letter["primary_letter"]
+    assert events[-1][1] == letter
+    assert SESSION_STORE.pop("stream-test")["analysis_results"]["cover_letter"] == letter
+
+    body = {"session_id": "stream-test", "intent": "interview_prep", "resume_text": " "}
+    with client.stream("POST", "/api/v1/stream/agent", json=body) as resp:
+        lines = list(resp.iter_lines())
+    assert "event: error" in lines
+
+
+def test_upload_rejects_wrong_signature_and_oversized_files(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "upload_max_bytes", 1024)
+    client = TestClient(create_app())
+
+    resp = client.post("/api/v1/resume/upload", files={"file": ("cv.pdf", b"PK\x03\x04 not a pdf", "application/pdf")})
+    assert resp.status_code == 415
+
+    # Over the file limit but within the multipart slack: caught while hashing.
+    resp = client.post("/api/v1/resume/upload", files={"file": ("cv.pdf", b"%PDF-" + b"x" * 4096, "application/pdf")})
+    assert resp.status_code == 413
+
+    # Declared Content-Length far over the limit: refused before reading,
+    # still with CORS headers so a cross-origin frontend can read it.
+    resp = client.post(
+        "/api/v1/resume/upload",
+        files={"file": ("cv.pdf", b"%PDF-" + b"x" * 200_000, "application/pdf")},
+        headers={"Origin": "http://localhost:5173"},
+    )
+    assert resp.status_code == 413
+    assert resp.headers["access-control-allow-origin"] == "http://localhost:5173"
+
+    # No Content-Length (chunked body): cut off mid-stream.
+    def body():
+        for _ in range(100):
+            yield b"x" * 8192
+
+    resp = client.post(
+        "/api/v1/resume/upload",
+        content=body(),
+        headers={"Content-Type": "multipart/form-data; boundary=xyz"},
+    )
+    assert resp.status_code == 413
+
+
+def test_upload_reports_extraction_mode():
+    from io import BytesIO
+    from fastapi.testclient import TestClient
+    from reportlab.pdfgen import canvas
+
+    buf = BytesIO()
+    c = canvas.Canvas(buf)
+    c.drawString(72, 720, "Extraction Report Tester")
+    c.drawString(72, 700, "Skills: Python")
+    c.save()
+    pdf = buf.getvalue()
+
+    client = TestClient(create_app())
+    first = client.post("/api/v1/resume/upload", files={"file": ("cv.pdf", pdf, "application/pdf")})
+    assert first.status_code == 200
+    assert first.json()["extraction"]["mode"] == "fast"
+    assert first.json()["extraction"]["pages"] == 1
+    again = client.post("/api/v1/resume/upload", files={"file": ("cv.pdf", pdf, "application/pdf")})
+    assert again.json()["extraction"]["mode"] == "cached"
+
+
+# Importing the app is a cold start on Vercel. The route modules must not pull
+# these in at import time, and the import itself must stay within budget
+# (override with IMPORT_BUDGET_SECONDS on slow machines).
+LAZY_MODULES = [
+    "langgraph", "langchain_core", "langchain_google_genai", "reportlab",
+    "pdfplumber", "pdfminer", "docx", "stripe", "sse_starlette", "numpy",
+]
+
+
+def test_app_import_stays_lazy_and_within_budget():
+    import json
+    import os
+    import subprocess
+    import sys
+
+    probe = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import app.main\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(json.dumps([elapsed, [m for m in {LAZY_MODULES!r} if m in sys.modules]]))\n"
+    )
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = [
+        json.loads(subprocess.run(
+            [sys.executable, "-c", probe], cwd=backend, capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1])
+        for _ in range(3)
+    ]
+    assert runs[0][1] == [], f"imported at startup: {runs[0][1]}"
+    budget = float(os.getenv("IMPORT_BUDGET_SECONDS", "1.8"))
+    best = min(elapsed for elapsed, _ in runs)
+    assert best < budget, f"import app.main took {best:.2f}s (budget {budget}s)"
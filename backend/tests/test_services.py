@@ -41,3 +41,841 @@ def test_parse_resume_text_projects():
     text = "Name\nemail@test.com\nproject\nApp One\nApp Two"
     result = parse_resume_text(text)
     assert len(result.projects) > 0
+
+
+SAMPLE_RESUME = """Jane Smith
+jane@email.com | +1 (555) 123-4567 | linkedin.com/in/jane | github.com/jane
+Summary
+Backend engineer building Python and AWS services.
+Experience
+• Led a team of 6 engineers to rebuild the billing API in FastAPI
+• Reduced p99 latency by 40% across 12 services
+• Increased revenue by 25 percent for over 3,000 customers
+- Automated deployments with Docker, Kubernetes and Terraform
+Education
+B.S. Computer Science, 2016
+Skills: Python, Go, PostgreSQL, Redis, React, Git"""
+
+
+def test_compute_ats_scores_sample_resume():
+    from app.services.ats_scorer import compute_ats_scores
+    assert compute_ats_scores(SAMPLE_RESUME) == {
+        "format_score": 90,
+        "keyword_score": 85,
+        "content_score": 82,
+        "completeness_score": 85,
+        "readability_score": 90,
+        "ats_score": 86,
+    }
+
+
+def test_compute_ats_scores_empty():
+    from app.services.ats_scorer import compute_ats_scores
+    scores = compute_ats_scores("")
+    assert scores["ats_score"] == 30
+    assert scores["readability_score"] == 50
+
+
+def test_compute_ats_scores_counts_whitespace_only_table_lines():
+    from app.services.ats_scorer import compute_ats_scores
+    scores = compute_ats_scores("a|b|c\nd|e\n\t\t\n\t\t\nName only")
+    assert scores["format_score"] == 24
+
+
+def test_keyword_score_counts_only_the_calibrated_vocabulary():
+    import json
+    from app.services.ats_scorer import KEYWORD_SCORE_SKILLS, compute_keyword_score, extract_line_features
+    from app.services.skill_matcher import DEFAULT_TAXONOMY_PATH
+
+    with open(DEFAULT_TAXONOMY_PATH) as f:
+        extra = [s["name"] for s in json.load(f)["skills"] if s["id"] not in KEYWORD_SCORE_SKILLS][:20]
+    features = [extract_line_features("Skills: " + ", ".join(extra + ["Python", "Docker"]))]
+    assert len(features[0].skills) >= 20
+    # Two calibrated skills band as two, however many others are listed.
+    assert compute_keyword_score(features) == 40
+
+
+def test_line_features():
+    from app.services.ats_scorer import extract_line_features
+    f = extract_line_features("• Reduced costs by 30% for 200 clients")
+    assert f.bullet and f.quantified and f.action_verb
+    assert extract_line_features("Skills: Python").section == "skills"
+    assert extract_line_features("   ").blank
+
+
+def test_skill_matcher_respects_token_boundaries():
+    from app.services.skill_matcher import get_skill_matcher
+    ids = get_skill_matcher().skill_ids("Googled rapid prototypes, legit APIs")
+    assert "go" not in ids
+    assert "git" not in ids
+    assert "api" in ids
+
+
+def test_skill_matcher_synonyms_and_positions():
+    from app.services.skill_matcher import get_skill_matcher
+    text = "Shipped JS services on k8s with CI/CD"
+    matches = get_skill_matcher().find(text)
+    found = {m.skill_id: text[m.start:m.end] for m in matches}
+    assert found["javascript"] == "JS"
+    assert found["kubernetes"] == "k8s"
+    assert found["ci/cd"] == "CI/CD"
+    # Overlapping terms resolve leftmost-longest, one match per span.
+    assert get_skill_matcher().find("Built on Node.js") == [("node", 9, 16)]
+    assert get_skill_matcher().find("ASP.NET Core") == [(".net", 0, 7)]
+
+
+def test_skill_matcher_phrase_gaps():
+    from app.services.skill_matcher import SkillMatcher
+    matcher = SkillMatcher([{"id": "power bi", "aliases": ["powerbi"]}, {"id": ".net"}])
+    assert matcher.skill_ids("Power BI dashboards") == {"power bi"}
+    assert matcher.skill_ids("power, bi") == set()
+    assert matcher.skill_ids("ASP.NET Core") == {".net"}
+    assert matcher.skill_ids("net revenue") == set()
+
+
+def test_compute_ats_scores_batch_matches_single_scoring():
+    from app.services.ats_scorer import compute_ats_scores, compute_ats_scores_batch
+    texts = [SAMPLE_RESUME, "", "Name only", SAMPLE_RESUME.upper()]
+    results = list(compute_ats_scores_batch(texts, chunk_size=1, max_in_flight=2))
+    assert sorted(r["index"] for r in results) == [0, 1, 2, 3]
+    for r in results:
+        assert r["scores"] == compute_ats_scores(texts[r["index"]])
+
+
+def test_compute_ats_scores_batch_isolates_item_errors():
+    from app.services.ats_scorer import compute_ats_scores_batch
+    results = {r["index"]: r for r in compute_ats_scores_batch([SAMPLE_RESUME, None, "x"], chunk_size=2)}
+    assert "scores" in results[0]
+    assert "error" in results[1]
+    assert "scores" in results[2]
+
+
+def test_rescore_reuses_unchanged_lines():
+    from app.services.ats_scorer import compute_ats_scores, line_feature_cache, rescore, score_with_handle
+    handle = score_with_handle(SAMPLE_RESUME)
+    edited = SAMPLE_RESUME.replace("Led a team of 6", "Led a team of 9") + "\nCertifications"
+    line_feature_cache.clear()
+    updated = rescore(handle, edited)
+    # Only the edited line and the new heading missed the previous handle.
+    assert line_feature_cache.misses == 2
+    assert updated.scores == compute_ats_scores(edited)
+
+
+def test_score_memo_hits_on_normalized_text():
+    from app.services.score_cache import InMemoryScoreBackend, ScoreMemo
+    memo = ScoreMemo(InMemoryScoreBackend(max_entries=10, ttl_seconds=60))
+    first = memo.get_or_compute(SAMPLE_RESUME)
+    second = memo.get_or_compute(SAMPLE_RESUME.replace("\n", "\r\n") + "\n\n")
+    assert first == second
+    assert (memo.hits, memo.misses) == (1, 1)
+
+
+def test_in_memory_score_backend_evicts_and_expires():
+    from app.services.score_cache import InMemoryScoreBackend
+    backend = InMemoryScoreBackend(max_entries=2, ttl_seconds=60)
+    for key in ("a", "b", "c"):
+        backend.set(key, {"ats_score": 1})
+    assert backend.get("a") is None
+    assert backend.get("c") == {"ats_score": 1}
+    expired = InMemoryScoreBackend(max_entries=2, ttl_seconds=-1)
+    expired.set("a", {"ats_score": 1})
+    assert expired.get("a") is None
+
+
+def test_score_memo_survives_backend_errors():
+    from app.services.score_cache import ScoreMemo
+
+    class BrokenBackend:
+        def get(self, key):
+            raise ConnectionError("redis down")
+
+        def set(self, key, value):
+            raise ConnectionError("redis down")
+
+    memo = ScoreMemo(BrokenBackend())
+    assert memo.get_or_compute("Skills: Python")["ats_score"] > 0
+    assert memo.errors == 2
+
+
+def test_score_percentiles_rank_against_stored_scores():
+    from app.services.score_percentiles import ScorePercentileStore
+    store = ScorePercentileStore()
+    assert store.percentiles({"ats_score": 50})["ats_score"] is None
+    store.add_many({"ats_score": s, "format_score": 100 - s} for s in (10, 50, 30, 90, 70))
+    store.add_many([{"ats_score": 50}])
+    assert len(store) == 6
+    result = store.percentiles({"ats_score": 50, "format_score": 50})
+    assert result["ats_score"] == 66.7
+    assert result["format_score"] == 60.0
+    assert result["keyword_score"] is None
+    assert list(store.rank_many("ats_score", [0, 100])) == [0.0, 100.0]
+
+
+def test_synthetic_resume_generator_is_seeded():
+    from app.services.ats_scorer import compute_ats_scores
+    from benchmarks.synthetic import generate_resume
+    text = generate_resume(seed=7, lines=80, bullet_density=1.0, table_density=0.0)
+    assert text == generate_resume(seed=7, lines=80, bullet_density=1.0, table_density=0.0)
+    assert text != generate_resume(seed=8, lines=80, bullet_density=1.0, table_density=0.0)
+    assert len(text.split("\n")) == 80
+    assert compute_ats_scores(text)["ats_score"] > 0
+
+
+def test_benchmark_compare_flags_regressions():
+    from benchmarks.run import compare
+    baseline = {"results": {"f[small]": {"best_p50_us": 100.0, "alloc_peak_kib": 10.0}}}
+    current = {"results": {
+        "f[small]": {"best_p50_us": 130.0, "alloc_peak_kib": 10.5},
+        "g[small]": {"best_p50_us": 1.0, "alloc_peak_kib": 1.0},
+    }}
+    assert compare(current, baseline, threshold=0.5) == []
+    regressions = compare(current, baseline, threshold=0.15)
+    assert len(regressions) == 1 and regressions[0].startswith("f[small] best_p50_us")
+
+
+def _make_pdf(pages):
+    from io import BytesIO
+    from reportlab.pdfgen import canvas
+    buf = BytesIO()
+    c = canvas.Canvas(buf)
+    for i in range(pages):
+        c.drawString(72, 720, f"Page {i} text")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def test_iter_pdf_pages_enforces_page_and_char_caps():
+    from app.services.resume_parser import extract_text_from_pdf, iter_pdf_pages
+    pdf = _make_pdf(5)
+    assert list(iter_pdf_pages(pdf, max_pages=100, max_chars=10_000)) == [f"Page {i} text" for i in range(5)]
+    assert list(iter_pdf_pages(pdf, max_pages=2, max_chars=10_000)) == ["Page 0 text", "Page 1 text"]
+    assert list(iter_pdf_pages(pdf, max_pages=100, max_chars=15)) == ["Page 0 text", "Page"]
+    assert extract_text_from_pdf(pdf) == "".join(f"Page {i} text" for i in range(5))
+
+
+def test_iter_pdf_pages_parallel_keeps_page_order(monkeypatch):
+    from app.core.config import settings
+    from app.services.resume_parser import iter_pdf_pages
+    monkeypatch.setattr(settings, "process_pool_workers", 2)
+    monkeypatch.setattr(settings, "pdf_parallel_min_pages", 2)
+    monkeypatch.setattr(settings, "pdf_pages_per_task", 2)
+    pdf = _make_pdf(7)
+    assert list(iter_pdf_pages(pdf, max_pages=6, max_chars=10_000)) == [f"Page {i} text" for i in range(6)]
+
+
+def test_pdf_fast_mode_matches_layout_and_escalates_interleaved_columns():
+    from io import BytesIO
+    from reportlab.pdfgen import canvas
+    from app.services.resume_parser import extract_pdf
+
+    buf = BytesIO()
+    c = canvas.Canvas(buf)
+    for i, line in enumerate(["Jane Doe", "Experience", "Built APIs in", "Python and Go", "Education"]):
+        c.drawString(72, 720 - i * 14, line)
+    c.save()
+    single = buf.getvalue()
+    fast = extract_pdf(single, parallel=False)
+    assert (fast.mode, fast.layout_pages) == ("fast", 0)
+    assert fast.text == extract_pdf(single, parallel=False, mode="layout").text
+
+    # A sidebar and a main column drawn line by line at different spacing.
+    buf = BytesIO()
+    c = canvas.Canvas(buf)
+    for i in range(12):
+        c.drawString(40, 800 - i * 17, f"Sidebar {i}")
+        c.drawString(220, 800 - i * 11, f"Main line {i}")
+    c.save()
+    columns = buf.getvalue()
+    auto = extract_pdf(columns, parallel=False)
+    assert (auto.mode, auto.pages, auto.layout_pages) == ("layout", 1, 1)
+    assert auto.text == extract_pdf(columns, parallel=False, mode="layout").text
+    assert auto.text != extract_pdf(columns, parallel=False, mode="fast").text
+
+
+def test_extract_text_from_spooled_upload_buffers():
+    from io import BytesIO
+    from tempfile import SpooledTemporaryFile
+    from docx import Document
+    from app.services.resume_parser import extract_text_from_docx, extract_text_from_pdf
+
+    pdf = SpooledTemporaryFile(max_size=1024 * 1024)
+    pdf.write(_make_pdf(2))
+    pdf.seek(0)
+    assert extract_text_from_pdf(pdf) == "Page 0 textPage 1 text"
+
+    doc = Document()
+    doc.add_paragraph("Jane Doe")
+    doc.add_paragraph("Python developer")
+    buf = BytesIO()
+    doc.save(buf)
+    assert extract_text_from_docx(buf.getvalue()) == "Jane Doe\nPython developer"
+
+
+def test_extraction_service_runs_jobs_off_loop_and_applies_backpressure():
+    import asyncio
+    import pytest
+    from app.services.extraction_service import (
+        ExtractionError, ExtractionQueueFull, ExtractionService, ExtractionUnavailable,
+    )
+
+    async def scenario():
+        service = ExtractionService(workers=1, queue_size=0, timeout_seconds=30)
+        first = asyncio.ensure_future(service.extract("cv.pdf", _make_pdf(2)))
+        await asyncio.sleep(0)
+        with pytest.raises(ExtractionQueueFull):
+            await service.extract("cv.pdf", _make_pdf(1))
+        extracted = await first
+        assert (extracted.text, extracted.mode, extracted.pages) == ("Page 0 textPage 1 text", "fast", 2)
+        with pytest.raises(ExtractionError):
+            await service.extract("cv.pdf", b"not a pdf")
+
+        slow = ExtractionService(workers=1, queue_size=0, timeout_seconds=0.001)
+        with pytest.raises(ExtractionUnavailable):
+            await slow.extract("cv.pdf", _make_pdf(1))
+        return service.stats(), slow.stats()
+
+    stats, slow_stats = asyncio.run(scenario())
+    assert (stats["completed"], stats["failed"], stats["rejected"]) == (1, 1, 1)
+    assert stats["running"] == stats["queued"] == 0
+    assert slow_stats["timeouts"] == 1
+
+
+def test_document_cache_shares_entries_through_the_database():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core.database import Base
+    from app.models.document_cache import DocumentCacheEntry
+    from app.services.document_cache import DocumentCache
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[DocumentCacheEntry.__table__])
+    db = sessionmaker(bind=engine)()
+
+    writer = DocumentCache(max_entries=4)
+    assert writer.get(db, "abc") is None
+    writer.put(db, "abc", "Jane Doe", {"name": "Jane Doe"})
+    writer.put(None, "abc", "Jane Doe", {"name": "Jane Doe"}, {"ats_score": 80})
+    writer.put(db, "abc", "Jane Doe", {"name": "Jane Doe"})
+    db.commit()
+    assert writer.get(None, "abc").analysis == {"ats_score": 80}
+
+    # Another worker: empty LRU, same table.
+    reader = DocumentCache(max_entries=4)
+    doc = reader.get(db, "abc")
+    assert doc.parsed_data == {"name": "Jane Doe"} and doc.analysis == {"ats_score": 80}
+    assert reader.get(db, "abc") is doc
+    assert reader.stats()["db_hits"] == 1 and reader.stats()["memory_hits"] == 1
+
+
+def test_document_cache_survives_missing_table():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.services.document_cache import DocumentCache
+
+    db = sessionmaker(bind=create_engine("sqlite://"))()
+    cache = DocumentCache(max_entries=4)
+    assert cache.get(db, "abc") is None
+    cache.put(db, "abc", "text", {}, {"ats_score": 1})
+    db.commit()
+    assert cache.errors == 2
+    assert cache.get(db, "abc").analysis == {"ats_score": 1}
+
+
+def test_classify_heading():
+    from app.services.sections import classify_heading
+    assert classify_heading("Work Experience") == "experience"
+    assert classify_heading("  ## EDUCATION  ") == "education"
+    assert classify_heading("**Key   Skills**:") == "skills"
+    assert classify_heading("Skills: Python, Go") == "skills"
+    assert classify_heading("Projects (3)") == "projects"
+    assert classify_heading("Experienced engineer at Google") is None
+    assert classify_heading("5 years of experience in Python") is None
+    # Field labels in the contact block are not headings; alone on a line they are.
+    assert classify_heading("Profile: https://linkedin.com/in/jane") is None
+    assert classify_heading("Contact: jane@example.com") is None
+    assert classify_heading("Profile") == "summary"
+    assert classify_heading("Summary: Backend engineer") == "summary"
+
+
+def test_section_index_is_shared_by_parser_and_export():
+    from app.services.sections import SectionSpan, build_section_index, section_index_from_data
+    from app.api.v1.export import _build_resume_story
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    index = build_section_index(SAMPLE_RESUME)
+    assert [(s.section, s.start, s.end) for s in index] == [
+        ("summary", 2, 4), ("experience", 4, 9), ("education", 9, 11), ("skills", 11, 12),
+    ]
+    parsed = parse_resume_text(SAMPLE_RESUME)
+    assert [SectionSpan(**s.model_dump()) for s in parsed.section_index] == index
+    assert "Go" in parsed.skills
+    assert section_index_from_data(parsed.model_dump(), SAMPLE_RESUME) == index
+    edited = "Jane Smith\nExperience\nBuilt things"
+    assert section_index_from_data(parsed.model_dump(), edited) == build_section_index(edited)
+    assert _build_resume_story(SAMPLE_RESUME, getSampleStyleSheet())
+
+
+def test_extract_text_from_docx_streams_tables_and_headers():
+    from io import BytesIO
+    from docx import Document
+    from app.services.resume_parser import extract_text_from_docx
+
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | jane@email.com"
+    p = doc.add_paragraph("Skills")
+    p.add_run().add_tab()
+    p.add_run("Python")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Go"
+    table.cell(0, 1).text = "Redis"
+    doc.add_paragraph("")
+    doc.add_paragraph("Experience")
+    buf = BytesIO()
+    doc.save(buf)
+    assert extract_text_from_docx(buf.getvalue()) == (
+        "Jane Doe | jane@email.com\nSkills\tPython\nGo\tRedis\n\nExperience"
+    )
+
+
+def test_extract_text_from_docx_resolves_parts_through_relationships():
+    import zipfile
+    from io import BytesIO
+    from docx import Document
+    from app.services.resume_parser import extract_text_from_docx
+
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | jane@email.com"
+    doc.add_paragraph("Experience")
+    buf = BytesIO()
+    doc.save(buf)
+
+    # Repackage the way some producers do: other part names, and a stray
+    # header part nothing refers to.
+    with zipfile.ZipFile(buf) as src:
+        header = next(n for n in src.namelist() if n.startswith("word/header"))
+        renames = {"word/document.xml": "word/main.xml", header: "word/top.xml",
+                   "word/_rels/document.xml.rels": "word/_rels/main.xml.rels"}
+        out = BytesIO()
+        with zipfile.ZipFile(out, "w") as dst:
+            for name in src.namelist():
+                data = src.read(name)
+                if name in ("_rels/.rels", "[Content_Types].xml"):
+                    data = data.replace(b"word/document.xml", b"word/main.xml")
+                    data = data.replace(header.encode(), b"word/top.xml")
+                elif name == "word/_rels/document.xml.rels":
+                    data = data.replace(header.split("/")[1].encode(), b"top.xml")
+                dst.writestr(renames.get(name, name), data)
+            dst.writestr("word/header9.xml", src.read(header).replace(b"Jane Doe", b"Orphan"))
+    assert extract_text_from_docx(out.getvalue()) == "Jane Doe | jane@email.com\nExperience"
+
+
+class _FakeChatModel:
+    model = "fake-model"
+    temperature = 0.0
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt, **kwargs):
+        from langchain_core.messages import AIMessage
+        self.calls += 1
+        return AIMessage(content=f"answer {self.calls}")
+
+    def with_structured_output(self, schema):
+        outer = self
+
+        class Structured:
+            async def ainvoke(self, prompt, **kwargs):
+                outer.calls += 1
+                return schema(summary=f"structured {outer.calls}")
+
+        return Structured()
+
+
+def test_llm_cache_hits_per_node_and_bypasses_creative_nodes(monkeypatch):
+    import asyncio
+    from pydantic import BaseModel
+    from app.core.config import settings
+    from app.services.llm_cache import CachedModel, get_llm_cache
+
+    class Out(BaseModel):
+        summary: str
+
+    monkeypatch.setattr(settings, "llm_cache_backend", "memory")
+    monkeypatch.setattr(settings, "llm_cache_ttls", "ats=60,job_match=60,chat=0")
+    get_llm_cache.cache_clear()
+    model = _FakeChatModel()
+    ats = CachedModel(model, "ats", Out)
+    job_match = CachedModel(model, "job_match")
+    chat = CachedModel(model, "chat")
+
+    async def scenario():
+        first = await ats.ainvoke("resume A")
+        again = await ats.ainvoke("resume A")
+        other = await ats.ainvoke("resume B")
+        text = [(await job_match.ainvoke([{"role": "user", "content": "JD"}])).content for _ in range(2)]
+        replies = [(await chat.ainvoke("hi")).content for _ in range(2)]
+        return first, again, other, text, replies
+
+    first, again, other, text, replies = asyncio.run(scenario())
+    assert isinstance(again, Out) and again == first
+    assert other.summary != first.summary
+    assert text[0] == text[1]
+    assert replies[0] != replies[1]
+    assert model.calls == 5
+
+    stats = get_llm_cache().stats()["nodes"]
+    assert stats["ats"] == {"hits": 1, "misses": 2, "bypassed": 0, "hit_rate": 0.3333}
+    assert stats["job_match"]["hits"] == 1
+    assert stats["chat"]["bypassed"] == 2
+    get_llm_cache.cache_clear()
+
+
+def test_llm_cache_never_caches_a_sampling_model(monkeypatch):
+    import asyncio
+    from app.core.config import settings
+    from app.services.llm_cache import CachedModel, get_llm_cache
+
+    class Sampling(_FakeChatModel):
+        temperature = 0.3
+
+    class Seeded(Sampling):
+        seed = 42
+
+    monkeypatch.setattr(settings, "llm_cache_backend", "memory")
+    monkeypatch.setattr(settings, "llm_cache_ttls", "analyze=60,ats=60")
+    get_llm_cache.cache_clear()
+    analyze = CachedModel(Sampling(), "analyze")
+    ats = CachedModel(Seeded(), "ats")
+
+    async def scenario():
+        sampled = [(await analyze.ainvoke("resume A")).content for _ in range(2)]
+        seeded = [(await ats.ainvoke("resume A")).content for _ in range(2)]
+        return sampled, seeded
+
+    sampled, seeded = asyncio.run(scenario())
+    assert sampled == ["answer 1", "answer 2"]
+    assert seeded == ["answer 1", "answer 1"]
+    stats = get_llm_cache().stats()["nodes"]
+    assert stats["analyze"]["bypassed"] == 2
+    assert stats["ats"]["hits"] == 1
+    get_llm_cache.cache_clear()
+
+
+def test_llm_cache_shares_responses_through_redis_tier():
+    import asyncio
+    from app.services.llm_cache import LLMResponseCache
+
+    class FakeRedis:
+        def __init__(self):
+            self.data = {}
+
+        def get(self, key):
+            return self.data.get(key)
+
+        def set(self, key, value, ex=None):
+            self.data[key] = value
+
+    redis = FakeRedis()
+    worker_a = LLMResponseCache(16, redis)
+    worker_b = LLMResponseCache(16, redis)
+
+    async def scenario():
+        await worker_a.set("k", {"content": "cached"}, 60)
+        return await worker_b.get("k", 60)
+
+    assert asyncio.run(scenario()) == {"content": "cached"}
+    assert list(redis.data) == ["hirelens:llm:k"]
+    assert worker_b.stats()["entries"] == 1
+
+
+def test_llm_registry_builds_clients_lazily_on_one_shared_channel(monkeypatch):
+    import asyncio
+    import pytest
+    from pydantic import BaseModel
+    from app.core.config import settings
+    from app.services.llm_registry import LLMHandle, LLMProfile, LLMRegistry
+
+    class Out(BaseModel):
+        summary: str
+
+    monkeypatch.setattr(settings, "google_api_key", "test-key")
+    registry = LLMRegistry()
+    plain = LLMHandle(LLMProfile("gemini-2.5-flash", 0.3), registry)
+    structured = LLMHandle(LLMProfile("gemini-2.5-flash", 0, 42), registry).with_structured_output(Out)
+    assert registry.stats()["clients_built"] == 0
+    assert structured.profile.name == "gemini-2.5-flash@0+seed42:Out"
+
+    a = registry.client(plain.profile)
+    b = registry.client(LLMProfile("gemini-2.5-flash", 0, 42))
+    assert a.client is b.client
+    assert (a.temperature, b.temperature, b.seed) == (0.3, 0, 42)
+    assert registry.client(plain.profile) is a
+
+    class Fake:
+        async def ainvoke(self, prompt, **kwargs):
+            if prompt == "boom":
+                raise RuntimeError("provider error")
+            return prompt
+
+    registry._clients[plain.profile] = Fake()
+
+    async def scenario():
+        assert await plain.ainvoke("hi") == "hi"
+        with pytest.raises(RuntimeError):
+            await plain.ainvoke("boom")
+
+    asyncio.run(scenario())
+    stats = registry.stats()["profiles"]["gemini-2.5-flash@0.3"]
+    assert (stats["calls"], stats["errors"]) == (2, 1)
+    assert stats["latency_ms_p50"] is not None
+
+
+def test_resume_context_strips_page_noise_and_keeps_content():
+    from app.services.resume_context import context_stats, resume_context
+
+    context_stats.clear()
+    pasted = (
+        "Jane Smith | jane@email.com\nSummary\nBackend   engineer,\t 8 years.\n\n\nExperience\n"
+        "Software Engineer\nSoftware Engineer\nBuilt billing\nPage 1 of 2\n"
+        "Jane Smith | jane@email.com\nEducation\nBSc CS\n- 2 -\n"
+    )
+    context = resume_context(pasted, "ats")
+    assert context.text == (
+        "Jane Smith | jane@email.com\n\nSummary\nBackend engineer, 8 years.\n\n"
+        "Experience\nSoftware Engineer\nSoftware Engineer\nBuilt billing\n\nEducation\nBSc CS"
+    )
+    assert context.saved > 0 and not context.trimmed
+    assert context_stats.stats()["nodes"]["ats"]["tokens_saved"] == context.saved
+
+
+def test_resume_context_trims_to_node_budget(monkeypatch):
+    from app.core.config import settings
+    from app.services.resume_context import estimate_tokens, resume_context
+
+    monkeypatch.setattr(settings, "resume_context_budgets", "interview_prep=300")
+    bullets = "\n".join(f"- Shipped feature {i} and cut costs by {i}%" for i in range(200))
+    text = f"Jane Smith\nExperience\n{bullets}\nEducation\nBSc CS\nInterests\n{bullets}"
+
+    context = resume_context(text, "interview_prep")
+    assert context.trimmed and context.tokens <= 300 == estimate_tokens("x" * 1200)
+    # Low-value sections go first; headings and the header always stay.
+    assert context.text.startswith("Jane Smith\n\nExperience\n- Shipped feature 0 ")
+    assert context.text.endswith("\n\nEducation\n\nInterests")
+    assert resume_context(text, "chat").text.count("Shipped") == 400
+
+
+def test_enhance_prompt_keeps_the_whole_resume_even_with_a_budget(monkeypatch):
+    from app.agents.resume_enhance_agent import _enhance_prompt
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "resume_context_budgets", "enhance=300")
+    bullets = "\n".join(f"- Shipped feature {i} and cut costs by {i}%" for i in range(200))
+    prompt = _enhance_prompt(f"Jane Smith\nExperience\n{bullets}\nProjects\n{bullets}")
+    assert prompt.count("Shipped") == 400
+
+
+def test_incremental_json_parser_reports_fields_as_they_complete():
+    import json
+    from app.services.partial_json import IncrementalJSONParser
+
+    doc = {
+        "target_role": "Backend \"Platform\" Engineer",
+        "questions": [{"category": "technical", "question": "Why [Go]?", "tips": "a, b}"}, {"n": -1.5, "ok": None}],
+        "empty": [],
+        "preparation_tips": "Practice.",
+    }
+    text = "```json\n" + json.dumps(doc, indent=2) + "\n```"
+    paths = [("target_role",), ("questions", "*"), ("empty",), ("preparation_tips",)]
+
+    whole = IncrementalJSONParser(paths).feed(text)
+    assert whole == [
+        (("target_role",), doc["target_role"]),
+        (("questions", 0), doc["questions"][0]),
+        (("questions", 1), doc["questions"][1]),
+        (("empty",), []),
+        (("preparation_tips",), "Practice."),
+    ]
+    parser = IncrementalJSONParser(paths)
+    chunked = []
+    for i in range(0, len(text), 3):
+        chunked += parser.feed(text[i:i + 3])
+        if i < text.index('"questions"'):
+            assert chunked == whole[:1] or not chunked
+    assert chunked == whole and parser.done
+    assert parser.text == text
+    # One character at a time: every value spans chunks.
+    single = IncrementalJSONParser(paths)
+    assert [event for c in text for event in single.feed(c)] == whole
+
+
+def test_incremental_json_parser_skips_values_that_are_not_json():
+    from app.services.partial_json import IncrementalJSONParser
+
+    text = '{"a": tru, "b": {"c": None}, "d\\q": "x", "e": "bad \\q", "f": "ok"}'
+    paths = [("a",), ("b",), ("d\\q",), ("e",), ("f",)]
+    parser = IncrementalJSONParser(paths)
+    events = []
+    for i in range(0, len(text), 4):
+        events += parser.feed(text[i:i + 4])
+    assert events == [(("d\\q",), "x"), (("f",), "ok")]
+    assert parser.done
+
+
+def test_repair_json_recovers_common_model_defects():
+    import pytest
+    from app.services.structured_output import StructuredOutputError, repair_json
+
+    assert repair_json('Here you go:\n```json\n{"a": [1, 2,], "b": {"c": "}",},}\n```\nAnything else? {x}') == {
+        "a": [1, 2], "b": {"c": "}"},
+    }
+    assert repair_json('{"ok": True, "none": None, note: "line\nbreak"}') == {
+        "ok": True, "none": None, "note": "line\nbreak",
+    }
+    # Cut off mid-document.
+    assert repair_json('{"letter": "Dear team", "tips": ["one", "tw') == {"letter": "Dear team", "tips": ["one", "tw"]}
+    assert repair_json('{"letter": "Dear team", "tips":') == {"letter": "Dear team", "tips": None}
+    with pytest.raises(StructuredOutputError):
+        repair_json("I cannot help with that.")
+
+
+def test_parse_structured_tracks_clean_repaired_and_failed_per_node():
+    import pytest
+    from pydantic import ValidationError
+    from app.schemas.interview import MockInterviewFeedback
+    from app.services.structured_output import parse_structured, structured_output_stats
+
+    structured_output_stats.clear()
+    answer = (
+        '{"clarity_score": 80, "structure_score": 70, "star_method_score": 60, '
+        '"relevance_score": 90, "feedback": "Good.", "improved_answer": "Better."}'
+    )
+    output, data = parse_structured(answer, MockInterviewFeedback, "mock_interview")
+    assert output.clarity_score == 80 and data["feedback"] == "Good."
+    output, _ = parse_structured("```json\n" + answer[:-1] + ",}\n```", MockInterviewFeedback, "mock_interview")
+    assert output.improved_answer == "Better."
+    with pytest.raises(ValidationError):
+        parse_structured('{"clarity_score": 80}', MockInterviewFeedback, "mock_interview")
+
+    stats = structured_output_stats.stats()["nodes"]["mock_interview"]
+    assert (stats["clean"], stats["repaired"], stats["failed"]) == (1, 1, 1)
+    assert stats["repair_rate"] == stats["failure_rate"] == round(1 / 3, 4)
+
+
+def test_single_flight_shares_one_call_and_cancels_only_when_every_waiter_leaves():
+    import asyncio
+    from app.services.single_flight import SingleFlight
+
+    flights = SingleFlight()
+    started = []
+
+    async def upstream(value, delay=0.05):
+        started.append(value)
+        await asyncio.sleep(delay)
+        return value
+
+    async def scenario():
+        shared = await asyncio.gather(*(flights.do("k", lambda: upstream("shared"), "ats") for _ in range(5)))
+
+        # One waiter leaving doesn't cancel the call the other still wants.
+        quitter = asyncio.ensure_future(flights.do("k", lambda: upstream("kept")))
+        stayer = asyncio.ensure_future(flights.do("k", lambda: upstream("other")))
+        await asyncio.sleep(0.01)
+        quitter.cancel()
+        kept = await stayer
+
+        # Every waiter leaving cancels it.
+        waiters = [asyncio.ensure_future(flights.do("k", lambda: upstream("dropped", 10))) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        return shared, quitter.cancelled(), kept
+
+    shared, quitter_cancelled, kept = asyncio.run(scenario())
+    assert shared == ["shared"] * 5
+    assert quitter_cancelled and kept == "kept"
+    assert started == ["shared", "kept", "dropped"]
+    stats = flights.stats()
+    assert (stats["calls"], stats["coalesced"], stats["cancelled"], stats["in_flight"]) == (3, 6, 1, 0)
+    assert stats["nodes"]["ats"] == {"calls": 1, "coalesced": 4, "cancelled": 0}
+
+
+def test_cached_model_coalesces_identical_calls_from_async_and_sync_callers(monkeypatch):
+    import asyncio
+    import threading
+    import time
+    from app.core.config import settings
+    from app.services.llm_cache import CachedModel, get_llm_cache
+
+    class SlowModel(_FakeChatModel):
+        async def ainvoke(self, prompt, **kwargs):
+            await asyncio.sleep(0.2)
+            return await super().ainvoke(prompt, **kwargs)
+
+    monkeypatch.setattr(settings, "llm_cache_backend", "memory")
+    monkeypatch.setattr(settings, "llm_cache_ttls", "cover_letter=0")
+    get_llm_cache.cache_clear()
+    model = SlowModel()
+    cover_letter = CachedModel(model, "cover_letter")
+
+    async def burst():
+        return await asyncio.gather(*(cover_letter.ainvoke("same prompt") for _ in range(10)))
+
+    assert {m.content for m in asyncio.run(burst())} == {"answer 1"}
+    assert model.calls == 1
+
+    # The sync path runs each request on its own event loop and thread.
+    replies = []
+    threads = [
+        threading.Thread(target=lambda: replies.append(asyncio.run(cover_letter.ainvoke("sync prompt")).content))
+        for _ in range(4)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert replies == ["answer 2"] * 4
+    assert model.calls == 2 and time.perf_counter() - started < 0.6
+
+    monkeypatch.setattr(settings, "llm_single_flight", False)
+    asyncio.run(burst())
+    assert model.calls == 12
+    get_llm_cache.cache_clear()
+
+
+def test_score_percentiles_refresh_off_the_request_path(monkeypatch):
+    import threading
+    import time
+    from app.services import score_percentiles
+    from app.services.score_percentiles import ScorePercentileStore
+
+    store = ScorePercentileStore()
+    loaded = threading.Event()
+    threads = []
+
+    def slow_refresh(db, batch_size=5000):
+        threads.append(threading.current_thread())
+        time.sleep(0.2)
+        store.add_many([{"ats_score": 40}])
+        store._refreshed_at = time.monotonic()
+        loaded.set()
+
+    class FakeSession:
+        def close(self):
+            pass
+
+    monkeypatch.setattr(score_percentiles, "SessionLocal", FakeSession)
+    monkeypatch.setattr(store, "refresh", slow_refresh)
+    started = time.perf_counter()
+    store.refresh_if_stale()
+    store.refresh_if_stale()
+    assert time.perf_counter() - started < 0.1
+    assert store.percentiles({"ats_score": 50})["ats_score"] is None
+    assert loaded.wait(2)
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
+    store._refresh_lock.acquire(timeout=2)
+    assert store.percentiles({"ats_score": 50})["ats_score"] == 100.0